@@ -0,0 +1,461 @@
+#!/usr/bin/env python3
+"""
+Eldertree Podcast Export Benchmark
+
+Generates a synthetic Cursor workspaceStorage (plus docs, blog posts and a
+git repository) and times export.py against it, end to end and stage by
+stage: workspace discovery, chat session parsing, categorization, the JSON
+write and git history. Each run happens in a fresh process so peak RSS is
+its own. Results are appended to a JSON Lines history and compared with the
+last run on the same corpus, so regressions show up as deltas.
+
+Usage:
+    python benchmark.py
+    python benchmark.py --workspaces 40 --sessions 25 --requests 30 --response-chars 4000
+    python benchmark.py --cases sessions end_to_end --workers 1 4 --repeat 5
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+from contextlib import redirect_stdout
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Optional
+
+# resource is optional - Unix only, used for peak RSS
+try:
+    import resource
+    HAS_RESOURCE = True
+except ImportError:
+    HAS_RESOURCE = False
+
+import export
+from export import EPISODE_KEYWORDS, PI_FLEET_ROOT, TOOL_INVOCATION_KIND
+
+CASES = ("workspaces", "sessions", "categorize", "write", "git", "end_to_end")
+CORPUS_DIR = PI_FLEET_ROOT / ".cache" / "podcast-bench-corpus"
+RESULTS_FILE = PI_FLEET_ROOT / ".cache" / "podcast-benchmarks.jsonl"
+# Marks a directory as a generated corpus (safe to delete and regenerate)
+CORPUS_FILE = "corpus.json"
+STORAGE_DIR = "workspaceStorage"
+REPO_DIR = "repo"
+
+FILLER = """
+    the a we then it this that with for on in to of and is was after before
+    again still now finally because while so but when node nodes pod pods
+    service config error logs kubectl apply restart check fixed broken works
+    update yaml manifest namespace deploy cluster eldertree worker control
+""".split()
+VOCABULARY = FILLER + [word for words in EPISODE_KEYWORDS.values() for word in words]
+
+
+def corpus_params(args: argparse.Namespace) -> dict[str, Any]:
+    return {
+        "workspaces": args.workspaces,
+        "other_workspaces": args.other_workspaces,
+        "sessions": args.sessions,
+        "requests": args.requests,
+        "response_chars": args.response_chars,
+        "tool_ratio": args.tool_ratio,
+        "docs": args.docs,
+        "blog_posts": args.blog_posts,
+        "commits": args.commits,
+        "seed": args.seed
+    }
+
+
+# --- Corpus generation -------------------------------------------------------
+
+class CorpusWriter:
+    """Writes a synthetic export input tree from ``params`` (see corpus_params)."""
+    
+    def __init__(self, root: Path, params: dict[str, Any]):
+        self.root = root
+        self.params = params
+        self.rng = random.Random(params["seed"])
+    
+    def text(self, chars: int) -> str:
+        """Roughly ``chars`` characters of words, episode keywords included."""
+        return " ".join(self.rng.choices(VOCABULARY, k=max(1, chars // 6)))
+    
+    def write(self) -> None:
+        start = time.perf_counter()
+        self.root.mkdir(parents=True)
+        self.write_workspaces()
+        self.write_markdown()
+        self.write_git_repo()
+        with open(self.root / CORPUS_FILE, "w") as f:
+            json.dump(self.params, f, indent=2)
+        print(f"[✓] Corpus generated in {time.perf_counter() - start:.1f}s: {self.root}")
+    
+    def write_workspaces(self) -> None:
+        p = self.params
+        storage = self.root / STORAGE_DIR
+        total = p["workspaces"] + p["other_workspaces"]
+        # Relevant and unrelated workspaces interleaved, as hashed dir names would be
+        relevant = set(self.rng.sample(range(total), p["workspaces"]))
+        for n in range(total):
+            workspace = storage / f"{n:08x}bench"
+            (workspace / "chatSessions").mkdir(parents=True)
+            folder = "file:///Users/bench/raolivei/pi-fleet" if n in relevant else f"file:///Users/bench/other-{n}"
+            with open(workspace / "workspace.json", "w") as f:
+                json.dump({"folder": folder}, f)
+            for s in range(p["sessions"]):
+                with open(workspace / "chatSessions" / f"session-{s:04d}.json", "w") as f:
+                    json.dump(self.session(f"{n}-{s}"), f)
+    
+    def session(self, session_id: str) -> dict[str, Any]:
+        p = self.params
+        created = 1_700_000_000_000 + self.rng.randrange(10 ** 10)
+        requests = []
+        for r in range(p["requests"]):
+            response: list[Any] = [{"value": self.text(p["response_chars"]), "supportThemeIcons": False}]
+            if self.rng.random() < p["tool_ratio"]:
+                response.insert(0, {
+                    "kind": TOOL_INVOCATION_KIND,
+                    "toolId": "run_terminal_command",
+                    "value": self.text(p["response_chars"] // 2),
+                    "resultDetails": {"output": self.text(p["response_chars"])}
+                })
+            requests.append({
+                "requestId": f"request_{session_id}-{r}",
+                "message": {"text": self.text(200)},
+                "response": response
+            })
+        return {
+            "version": 3,
+            "sessionId": session_id,
+            "creationDate": created,
+            "lastMessageDate": created + 3_600_000,
+            "requests": requests
+        }
+    
+    def write_markdown(self) -> None:
+        repo = self.root / REPO_DIR
+        (repo / "docs").mkdir(parents=True)
+        (repo / "blog").mkdir()
+        for n in range(self.params["docs"]):
+            title = " ".join(self.rng.choices(VOCABULARY, k=4)).title()
+            body = "\n\n".join(self.text(600) for _ in range(self.rng.randint(3, 12)))
+            (repo / "docs" / f"DOC_{n:04d}.md").write_text(f"# {title}\n\n{body}\n")
+        for n in range(self.params["blog_posts"]):
+            title = " ".join(self.rng.choices(VOCABULARY, k=5)).title()
+            body = "\n\n".join(self.text(800) for _ in range(self.rng.randint(5, 15)))
+            (repo / "blog" / f"2025-{n % 12 + 1:02d}-{n % 28 + 1:02d}-post-{n}.md").write_text(f"# {title}\n\n{body}\n")
+    
+    def write_git_repo(self) -> None:
+        """Build the history with git fast-import, far quicker than one commit per process."""
+        repo = self.root / REPO_DIR
+        subprocess.run(["git", "init", "-q", str(repo)], check=True)
+        stream = []
+        for n in range(1, self.params["commits"] + 1):
+            subject = " ".join(self.rng.choices(VOCABULARY, k=6))
+            if n % 7 == 0:
+                subject += " | pipes in subject"
+            message = f"{subject}\n\n{self.text(300)}\n".encode()
+            content = f"{n}\n".encode()
+            stream += [
+                b"commit refs/heads/main\n",
+                f"mark :{n}\n".encode(),
+                f"committer Bench <bench@example.com> {1_700_000_000 + n * 3600} +0000\n".encode(),
+                f"data {len(message)}\n".encode(), message
+            ]
+            if n > 1:
+                stream.append(f"from :{n - 1}\n".encode())
+            stream += [b"M 644 inline counter.txt\n", f"data {len(content)}\n".encode(), content, b"\n"]
+        subprocess.run(["git", "fast-import", "--quiet"], cwd=repo, input=b"".join(stream), check=True)
+        subprocess.run(["git", "symbolic-ref", "HEAD", "refs/heads/main"], cwd=repo, check=True)
+
+
+def prepare_corpus(root: Path, params: dict[str, Any]) -> None:
+    """Reuse ``root`` if it was generated from ``params``, else (re)generate it."""
+    marker = root / CORPUS_FILE
+    if marker.exists():
+        with open(marker) as f:
+            if json.load(f) == params:
+                print(f"[*] Reusing corpus: {root}")
+                return
+        shutil.rmtree(root)
+    elif root.exists() and any(root.iterdir()):
+        sys.exit(f"Error: {root} exists and is not a benchmark corpus")
+    CorpusWriter(root, params).write()
+
+
+# --- Cases (run in a child process) -----------------------------------------
+
+def point_export_at(corpus: Path) -> None:
+    """Redirect export.py's input paths and caches into the corpus."""
+    repo = corpus / REPO_DIR
+    export.CURSOR_STORAGE = corpus / STORAGE_DIR
+    export.PI_FLEET_ROOT = repo
+    export.DOCS_DIR = repo / "docs"
+    export.BLOG_DIR = repo / "blog"
+    export.MATCHER_CACHE = corpus / ".cache" / "podcast-matcher.pickle"
+    export.GITHUB_CACHE_DIR = corpus / ".cache"
+
+
+def session_bytes(workspaces: list[Path]) -> int:
+    return sum(f.stat().st_size for ws in workspaces for f in export.session_files(ws))
+
+
+def run_case(case: str, corpus: Path, workers: int, output_format: str) -> dict[str, Any]:
+    """Run one case once; returns items, bytes and time spent outside setup."""
+    point_export_at(corpus)
+    output_dir = corpus / "out"
+    shutil.rmtree(output_dir, ignore_errors=True)
+    output_dir.mkdir()
+    
+    def timed(fn, *args, **kwargs):
+        # Own CPU at full resolution; pool workers' only once reaped, in clock ticks
+        cpu, children = time.process_time(), os.times()
+        wall = time.perf_counter()
+        result = fn(*args, **kwargs)
+        wall = time.perf_counter() - wall
+        after = os.times()
+        cpu = time.process_time() - cpu + (after.children_user + after.children_system
+                                           - children.children_user - children.children_system)
+        return result, wall, cpu
+    
+    with redirect_stdout(sys.stderr):
+        stages = None
+        if case == "workspaces":
+            workspaces, wall, cpu = timed(export.find_relevant_workspaces, workers)
+            items, size = len(workspaces), 0
+        elif case == "sessions":
+            workspaces = export.find_relevant_workspaces(workers)
+            sessions, wall, cpu = timed(export.parse_all_sessions, workspaces, workers)
+            items, size = len(sessions), session_bytes(workspaces)
+        elif case == "categorize":
+            matcher = export.build_matcher(export.CONFIG_FILE)
+            docs = export.read_documentation()
+            sessions = export.parse_all_sessions(export.find_relevant_workspaces(workers), workers)
+            _, wall, cpu = timed(export.categorize_content, docs, sessions, matcher)
+            items = len(docs) + len(sessions)
+            size = sum(len(export.category_text(d, "documentation")) for d in docs) + sum(
+                len(export.category_text(s, "conversation")) for s in sessions
+            )
+        elif case == "write":
+            docs = export.read_documentation()
+            sessions = export.parse_all_sessions(export.find_relevant_workspaces(workers), workers)
+            data = {
+                "metadata": {},
+                "chat_sessions": sessions,
+                "documentation": docs,
+                "blog_posts": export.read_blog_posts(),
+                "git_history": export.get_git_history(0),
+                "github_issues": [],
+                "categorized_by_episode": export.categorize_content(docs, sessions)
+            }
+            
+            def write():
+                with open(output_dir / "raw-export.json", "w") as f:
+                    json.dump(data, f, indent=2, default=str)
+            
+            _, wall, cpu = timed(write)
+            items = len(sessions) + len(docs) + len(data["blog_posts"]) + len(data["git_history"])
+            size = (output_dir / "raw-export.json").stat().st_size
+        elif case == "git":
+            commits, wall, cpu = timed(export.get_git_history, 0)
+            items, size = len(commits), 0
+        elif case == "end_to_end":
+            _, wall, cpu = timed(
+                export.export_data, output_dir, include_github=False, workers=workers,
+                output_format=output_format, git_limit=0
+            )
+            with open(output_dir / "metrics.json") as f:
+                metrics = json.load(f)["stages"]
+            stages = {name: stage["wall_seconds"] for name, stage in metrics.items()}
+            items = sum(stage["items"] for name, stage in metrics.items() if name != "write")
+            size = sum(stage["bytes"] for stage in metrics.values())
+        else:
+            raise ValueError(f"Unknown case: {case}")
+    
+    result = {"wall_seconds": wall, "cpu_seconds": cpu, "items": items, "bytes": size}
+    if HAS_RESOURCE:
+        peak = max(
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+            resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+        )
+        result["peak_rss_mb"] = peak / (1 << 20) if sys.platform == "darwin" else peak / (1 << 10)
+    if stages:
+        result["stages"] = stages
+    return result
+
+
+def run_in_child(case: str, corpus: Path, workers: int, output_format: str) -> dict[str, Any]:
+    result = subprocess.run(
+        [sys.executable, __file__, "--child", case, "--corpus", str(corpus),
+         "--workers", str(workers), "--format", output_format],
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"{case} (workers={workers}) failed:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+# --- Results -----------------------------------------------------------------
+
+def summarize(case: str, workers: int, output_format: str, runs: list[dict[str, Any]]) -> dict[str, Any]:
+    """Median of the runs, plus throughput; the raw runs are kept alongside."""
+    wall = statistics.median(run["wall_seconds"] for run in runs)
+    first = runs[0]
+    summary = {
+        "case": case,
+        "workers": workers,
+        "format": output_format,
+        "wall_seconds": round(wall, 4),
+        "cpu_seconds": round(statistics.median(run["cpu_seconds"] for run in runs), 4),
+        "items": first["items"],
+        "bytes": first["bytes"],
+        "items_per_second": round(first["items"] / wall, 1) if wall else None,
+        "mb_per_second": round(first["bytes"] / (1 << 20) / wall, 2) if wall and first["bytes"] else None,
+        "peak_rss_mb": round(max(run.get("peak_rss_mb", 0) for run in runs), 1) if HAS_RESOURCE else None,
+        "runs": [round(run["wall_seconds"], 4) for run in runs]
+    }
+    if "stages" in first:
+        summary["stages"] = {
+            name: round(statistics.median(run["stages"][name] for run in runs), 4)
+            for name in first["stages"]
+        }
+    return summary
+
+
+def previous_results(results_file: Path, params: dict[str, Any]) -> dict[tuple, dict[str, Any]]:
+    """Results of the last recorded run on the same corpus, keyed by (case, workers, format)."""
+    last: Optional[dict[str, Any]] = None
+    if results_file.exists():
+        with open(results_file) as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if record.get("corpus") == params:
+                    last = record
+    if not last:
+        return {}
+    return {(r["case"], r["workers"], r["format"]): r for r in last["results"]}
+
+
+def git_revision() -> Optional[str]:
+    result = subprocess.run(
+        ["git", "rev-parse", "--short", "HEAD"], cwd=PI_FLEET_ROOT, capture_output=True, text=True
+    )
+    return result.stdout.strip() if result.returncode == 0 else None
+
+
+def print_results(results: list[dict[str, Any]], previous: dict[tuple, dict[str, Any]]) -> None:
+    print(f"\n{'case':<12} {'workers':>7} {'wall s':>8} {'cpu s':>8} {'items/s':>10} "
+          f"{'MiB/s':>8} {'RSS MiB':>8} {'vs last':>8}")
+    for r in results:
+        before = previous.get((r["case"], r["workers"], r["format"]))
+        delta = f"{(r['wall_seconds'] / before['wall_seconds'] - 1):+.0%}" if before and before["wall_seconds"] else "-"
+        print(f"{r['case']:<12} {r['workers']:>7} {r['wall_seconds']:>8.3f} {r['cpu_seconds']:>8.3f} "
+              f"{r['items_per_second'] or 0:>10.1f} {r['mb_per_second'] or 0:>8.2f} "
+              f"{r['peak_rss_mb'] or 0:>8.1f} {delta:>8}")
+        for name, seconds in r.get("stages", {}).items():
+            print(f"  {name:<18} {seconds:>8.3f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark export.py on a synthetic Cursor workspace corpus"
+    )
+    corpus = parser.add_argument_group("corpus")
+    corpus.add_argument("--workspaces", type=int, default=20, help="Relevant workspaces (default: 20)")
+    corpus.add_argument("--other-workspaces", type=int, default=5,
+                        help="Workspaces of other projects, skipped by discovery (default: 5)")
+    corpus.add_argument("--sessions", type=int, default=10, help="Chat sessions per workspace (default: 10)")
+    corpus.add_argument("--requests", type=int, default=20, help="Requests per session (default: 20)")
+    corpus.add_argument("--response-chars", type=int, default=2000,
+                        help="Characters of assistant text per response (default: 2000)")
+    corpus.add_argument("--tool-ratio", type=float, default=0.3,
+                        help="Share of responses that also carry a tool invocation (default: 0.3)")
+    corpus.add_argument("--docs", type=int, default=100, help="Markdown docs (default: 100)")
+    corpus.add_argument("--blog-posts", type=int, default=10, help="Blog posts (default: 10)")
+    corpus.add_argument("--commits", type=int, default=500, help="Git commits (default: 500)")
+    corpus.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    
+    parser.add_argument(
+        "--corpus",
+        type=Path,
+        default=CORPUS_DIR,
+        help="Where to generate (or reuse) the corpus"
+    )
+    parser.add_argument(
+        "--cases",
+        nargs="+",
+        choices=CASES,
+        default=list(CASES),
+        help="Cases to run (default: all)"
+    )
+    parser.add_argument(
+        "--workers", "-j",
+        type=int,
+        nargs="+",
+        default=[1],
+        help="Worker counts to run each case with (default: 1)"
+    )
+    parser.add_argument(
+        "--format",
+        choices=["json", "jsonl"],
+        default="json",
+        help="Output format for the end_to_end case"
+    )
+    parser.add_argument(
+        "--repeat", "-r",
+        type=int,
+        default=3,
+        help="Runs per case; the median is reported (default: 3)"
+    )
+    parser.add_argument(
+        "--results",
+        type=Path,
+        default=RESULTS_FILE,
+        help="JSON Lines file the results are appended to and compared against"
+    )
+    parser.add_argument("--child", choices=CASES, help=argparse.SUPPRESS)
+    
+    args = parser.parse_args()
+    
+    if args.child:
+        result = run_case(args.child, args.corpus, args.workers[0], args.format)
+        print(json.dumps(result))
+        return
+    
+    params = corpus_params(args)
+    prepare_corpus(args.corpus, params)
+    previous = previous_results(args.results, params)
+    
+    results = []
+    for case in args.cases:
+        for workers in args.workers:
+            print(f"[*] {case} (workers={workers}) x{args.repeat}")
+            runs = [run_in_child(case, args.corpus, workers, args.format) for _ in range(args.repeat)]
+            results.append(summarize(case, workers, args.format, runs))
+    
+    print_results(results, previous)
+    
+    args.results.parent.mkdir(parents=True, exist_ok=True)
+    with open(args.results, "a") as f:
+        f.write(json.dumps({
+            "timestamp": datetime.now().isoformat(),
+            "revision": git_revision(),
+            "python": sys.version.split()[0],
+            "cpus": os.cpu_count(),
+            "corpus": params,
+            "results": results
+        }) + "\n")
+    print(f"\n[✓] Results appended to: {args.results}")
+
+
+if __name__ == "__main__":
+    main()
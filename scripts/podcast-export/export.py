@@ -8,17 +8,33 @@ into structured data for podcast episode generation.
 Usage:
     python export.py --output ./podcast-data
     python export.py --config config.yaml --output ./podcast-data
+    python export.py --workers 8 --output ./podcast-data
+    python export.py --format jsonl --output ./podcast-data
+    python export.py --profile --output ./podcast-data
 """
 
 import argparse
+import cProfile
+import hashlib
+import heapq
 import json
+import multiprocessing
 import os
+import pickle
 import re
+import shutil
 import subprocess
 import sys
+import threading
+import time
+import zlib
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
+from itertools import repeat
+from operator import itemgetter
 from pathlib import Path
-from typing import Any, Optional, List, Dict
+from typing import Any, Iterator, Optional, List, Dict
 
 # yaml is optional - only needed if using config.yaml
 try:
@@ -27,433 +43,1496 @@ try:
 except ImportError:
     HAS_YAML = False
 
+# ijson is optional - streams very large chat session files
+try:
+    import ijson
+    HAS_IJSON = True
+except ImportError:
+    HAS_IJSON = False
+
+# pyahocorasick is optional - C keyword automaton for categorization
+try:
+    import ahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+
+from metrics import METRICS_FILE, PROFILE_FILE, StageMetrics
+from store import STORE_FILE, ExportStore, has_fts5
+
 # Default paths
 HOME = Path.home()
 CURSOR_STORAGE = HOME / "Library/Application Support/Cursor/User/workspaceStorage"
 PI_FLEET_ROOT = Path(__file__).parent.parent.parent
 DOCS_DIR = PI_FLEET_ROOT / "docs"
 BLOG_DIR = PI_FLEET_ROOT / "blog"
+INDEX_FILE = "export-index.json"
+CONFIG_FILE = Path(__file__).parent / "config.yaml"
+# Compiled keyword matcher, keyed by config and script hash
+MATCHER_CACHE = PI_FLEET_ROOT / ".cache" / "podcast-matcher.pickle"
+
+# Sharded (--format jsonl) output layout
+SHARDS_DIR = "shards"
+MANIFEST_FILE = "manifest.json"
+CATEGORIES_FILE = "categories.json"
+OFFSETS_FILE = "offsets.json"
+SHARD_NAMES = ("chat_sessions", "documentation", "blog_posts", "git_history", "github_issues")
+# What each --format writes; a run removes the other format's files so
+# generate_episodes.py can't pick up a stale export from the same directory
+FORMAT_FILES = {
+    "json": ("raw-export.json", "episodes"),
+    "jsonl": (SHARDS_DIR, CATEGORIES_FILE, OFFSETS_FILE, MANIFEST_FILE),
+}
+
+# Session pool workers start from a fresh interpreter: the git/gh collector
+# threads are already running when the pool starts, and forking a process
+# with live threads can deadlock the child (3.12+ also warns about it)
+POOL_START_METHOD = (
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+# Block size for hashing files into the export index
+HASH_CHUNK_BYTES = 1 << 16
 
+# Assistant responses are truncated to this many characters
+MAX_RESPONSE_CHARS = 10000
+# Session files at least this large are parsed with ijson when it is installed
+STREAM_MIN_BYTES = 16 * 1024 * 1024
+TOOL_INVOCATION_KIND = "toolInvocationSerialized"
 
-def find_relevant_workspaces() -> list[Path]:
-    """Find Cursor workspaces related to raolivei/pi-fleet."""
-    relevant_workspaces = []
+# git log -z: NUL between commits and between their fields, so subjects and
+# bodies may contain any other character
+GIT_LOG_FORMAT = "%H%x00%ai%x00%s%x00%b"
+GIT_LOG_FIELDS = 4
+GIT_READ_BYTES = 1 << 16
+
+# Default seconds before a git/gh subprocess is killed (--stage-timeout)
+STAGE_TIMEOUTS = {"git_history": 120, "github_issues": 300}
+ISSUE_FIELDS = "number,title,body,state,createdAt,closedAt,updatedAt,labels"
+PR_FIELDS = "number,title,body,state,createdAt,mergedAt,updatedAt,labels"
+
+# Fetched issues/PRs per repo; refreshed with an updatedAt search (--offline reads it only)
+GITHUB_CACHE_DIR = PI_FLEET_ROOT / ".cache"
+# gh list pages through everything up to --limit; searches stop at 1000 results
+GH_FETCH_ALL = 1_000_000
+GH_SEARCH_CAP = 1000
+
+# --dedup: word n-gram size, anchor hashes per record, and the Jaccard
+# similarity at which two records count as the same content
+SHINGLE_WORDS = 5
+SHINGLE_ANCHORS = 8
+NEAR_DUP_JACCARD = 0.9
+
+
+class ExportIndex:
+    """Per-file fingerprints and extracted records from the previous export.
     
-    if not CURSOR_STORAGE.exists():
-        print(f"Warning: Cursor storage not found at {CURSOR_STORAGE}")
-        return relevant_workspaces
+    A file whose (mtime, size) still match is reused without being read; if
+    only the mtime moved, its content hash decides. A miss remembers the
+    file's (mtime, size); ``store`` only keeps the new records if the file
+    still has them after hashing, so a file edited while it was being parsed
+    is read again next time. Entries for files not seen in this run are
+    dropped on save. ``git_history`` holds the commits of the last export
+    (see get_git_history) so only new ones are read.
+    """
     
-    for workspace_dir in CURSOR_STORAGE.iterdir():
-        if not workspace_dir.is_dir():
-            continue
-        
-        workspace_json = workspace_dir / "workspace.json"
-        if workspace_json.exists():
+    def __init__(self, path: Path):
+        self.path = path
+        self.entries: dict[str, dict[str, Any]] = {}
+        self.seen: dict[str, dict[str, Any]] = {}
+        self.pending: dict[str, tuple[int, int]] = {}
+        self.git_history: Optional[dict[str, Any]] = None
+        self.reused = 0
+        self.parsed = 0
+        if path.exists():
             try:
-                with open(workspace_json) as f:
+                with open(path) as f:
                     data = json.load(f)
-                folder = data.get("folder", "") or data.get("workspace", "")
-                if "raolivei" in folder or "pi-fleet" in folder:
-                    relevant_workspaces.append(workspace_dir)
-            except (json.JSONDecodeError, IOError):
-                continue
+                self.entries = data.get("files", {})
+                self.git_history = data.get("git_history")
+            except (json.JSONDecodeError, IOError) as e:
+                print(f"Warning: Ignoring unreadable index {path}: {e}")
+    
+    @staticmethod
+    def fingerprint(file: Path, with_hash: bool = True) -> dict[str, Any]:
+        stat = file.stat()
+        fingerprint = {"mtime": stat.st_mtime_ns, "size": stat.st_size}
+        if with_hash:
+            h = hashlib.sha256()
+            with open(file, "rb") as f:
+                for chunk in iter(lambda: f.read(HASH_CHUNK_BYTES), b""):
+                    h.update(chunk)
+            fingerprint["sha256"] = h.hexdigest()
+        return fingerprint
+    
+    def lookup(self, file: Path) -> Optional[list]:
+        """Return the cached records for an unchanged file, else None."""
+        key = str(file)
+        entry = self.entries.get(key)
+        try:
+            current = self.fingerprint(file, with_hash=False)
+        except OSError:
+            return None
+        self.pending[key] = (current["mtime"], current["size"])
+        if not entry:
+            return None
+        try:
+            if (current["mtime"], current["size"]) != (entry["mtime"], entry["size"]):
+                if current["size"] != entry["size"]:
+                    return None
+                current = self.fingerprint(file)
+                if current["sha256"] != entry["sha256"]:
+                    return None
+        except OSError:
+            return None
+        del self.pending[key]
+        self.seen[key] = {**entry, **current}
+        self.reused += 1
+        return entry["records"]
     
-    return relevant_workspaces
+    def store(self, file: Path, records: list) -> None:
+        """Index ``records`` for a file ``lookup`` missed, unless it changed since."""
+        key = str(file)
+        before = self.pending.pop(key, None)
+        try:
+            fingerprint = self.fingerprint(file)
+            after = self.fingerprint(file, with_hash=False)
+        except OSError:
+            return
+        self.parsed += 1
+        stat = (fingerprint["mtime"], fingerprint["size"])
+        if before != stat or (after["mtime"], after["size"]) != stat:
+            return
+        self.seen[key] = {**fingerprint, "records": records}
+    
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "w") as f:
+            json.dump({"files": self.seen, "git_history": self.git_history}, f, default=str)
 
 
-def parse_chat_sessions(workspace_dir: Path) -> list[dict[str, Any]]:
-    """Parse chat session JSON files from a workspace."""
-    sessions = []
-    chat_sessions_dir = workspace_dir / "chatSessions"
+def is_relevant_workspace(workspace_dir: Path) -> bool:
+    """Check whether a workspace's folder points at raolivei/pi-fleet."""
+    workspace_json = workspace_dir / "workspace.json"
+    if not workspace_json.exists():
+        return False
+    try:
+        with open(workspace_json) as f:
+            data = json.load(f)
+        folder = data.get("folder", "") or data.get("workspace", "")
+        return "raolivei" in folder or "pi-fleet" in folder
+    except (json.JSONDecodeError, IOError):
+        return False
+
+
+def find_relevant_workspaces(workers: int = 1) -> list[Path]:
+    """Find Cursor workspaces related to raolivei/pi-fleet.
     
-    if not chat_sessions_dir.exists():
-        return sessions
+    Discovery is I/O-bound (one small workspace.json per directory), so with
+    ``workers > 1`` the checks run on a thread pool. Results are sorted by
+    path either way.
+    """
+    if not CURSOR_STORAGE.exists():
+        print(f"Warning: Cursor storage not found at {CURSOR_STORAGE}")
+        return []
     
-    for session_file in chat_sessions_dir.glob("*.json"):
-        try:
-            with open(session_file) as f:
-                session_data = json.load(f)
+    candidates = sorted(d for d in CURSOR_STORAGE.iterdir() if d.is_dir())
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            relevant = list(pool.map(is_relevant_workspace, candidates))
+    else:
+        relevant = [is_relevant_workspace(d) for d in candidates]
+    
+    return [d for d, keep in zip(candidates, relevant) if keep]
+
+
+def parse_session_stream(session_file: Path, workspace_dir: Path) -> Optional[dict[str, Any]]:
+    """Event-streaming equivalent of parse_session_file for very large sessions.
+    
+    Walks ``requests[*].message.text`` and ``response[*]`` as ijson events, so
+    tool invocation payloads are never built into objects and response text
+    stops accumulating at MAX_RESPONSE_CHARS. Peak memory follows the text
+    kept, not the file size.
+    """
+    scalars = ("string", "number", "boolean", "null")
+    meta: dict[str, Any] = {}
+    conversations = []
+    has_requests = False
+    request: Optional[dict[str, Any]] = None
+    part: Optional[dict[str, Any]] = None
+    
+    def add_response(text: str) -> None:
+        room = MAX_RESPONSE_CHARS - len(request["assistant"])
+        if room > 0:
+            request["assistant"] += text[:room]
+    
+    try:
+        with open(session_file, "rb") as f:
+            for prefix, event, value in ijson.parse(f, use_float=True):
+                if prefix in ("sessionId", "creationDate", "lastMessageDate"):
+                    if event in scalars:
+                        meta[prefix] = value
+                elif prefix == "requests.item":
+                    if event == "start_map":
+                        has_requests = True
+                        request = {"user": "", "assistant": "", "request_id": ""}
+                    elif event == "end_map" and request is not None:
+                        if request["user"] or request["assistant"]:
+                            conversations.append(request)
+                        request = None
+                elif request is None:
+                    continue
+                elif prefix == "requests.item.requestId" and event in scalars:
+                    request["request_id"] = value
+                elif prefix == "requests.item.message.text" and event in scalars:
+                    request["user"] = value
+                elif prefix == "requests.item.response.item":
+                    if event == "string":
+                        add_response(value)
+                    elif event == "start_map":
+                        part = {"kind": None, "value": ""}
+                    elif event == "end_map" and part is not None:
+                        if part["value"] and part["kind"] != TOOL_INVOCATION_KIND:
+                            add_response(part["value"])
+                        part = None
+                elif part is None:
+                    continue
+                elif prefix == "requests.item.response.item.kind" and event in scalars:
+                    part["kind"] = value
+                elif prefix == "requests.item.response.item.value" and event == "string":
+                    # "kind" may come later in the object, so hold at most what fits
+                    part["value"] = value[:MAX_RESPONSE_CHARS - len(request["assistant"])]
+    except (ijson.JSONError, IOError) as e:
+        print(f"Warning: Could not parse {session_file}: {e}")
+        return None
+    
+    if not has_requests or not conversations:
+        return None
+    return {
+        "session_id": meta.get("sessionId", session_file.stem),
+        "created_date": meta.get("creationDate"),
+        "last_message_date": meta.get("lastMessageDate"),
+        "workspace": str(workspace_dir),
+        "conversations": conversations
+    }
+
+
+def parse_session_file(session_file: Path, workspace_dir: Path) -> Optional[dict[str, Any]]:
+    """Parse one chat session JSON file; None if it has no usable conversation."""
+    try:
+        if HAS_IJSON and session_file.stat().st_size >= STREAM_MIN_BYTES:
+            return parse_session_stream(session_file, workspace_dir)
+        
+        with open(session_file) as f:
+            session_data = json.load(f)
+        
+        # Extract relevant conversation data
+        requests = session_data.get("requests", [])
+        if not requests:
+            return None
+        
+        session_info = {
+            "session_id": session_data.get("sessionId", session_file.stem),
+            "created_date": session_data.get("creationDate"),
+            "last_message_date": session_data.get("lastMessageDate"),
+            "workspace": str(workspace_dir),
+            "conversations": []
+        }
+        
+        for request in requests:
+            message = request.get("message", {})
+            response = request.get("response", [])
             
-            # Extract relevant conversation data
-            requests = session_data.get("requests", [])
-            if not requests:
-                continue
+            # Extract message text
+            message_text = message.get("text", "")
             
-            session_info = {
-                "session_id": session_data.get("sessionId", session_file.stem),
-                "created_date": session_data.get("creationDate"),
-                "last_message_date": session_data.get("lastMessageDate"),
-                "workspace": str(workspace_dir),
-                "conversations": []
-            }
+            # Extract response text (filter out tool invocations)
+            response_text = ""
+            for resp_part in response:
+                if isinstance(resp_part, dict):
+                    value = resp_part.get("value", "")
+                    if value and resp_part.get("kind") != TOOL_INVOCATION_KIND:
+                        response_text += value
+                elif isinstance(resp_part, str):
+                    response_text += resp_part
             
-            for request in requests:
-                message = request.get("message", {})
-                response = request.get("response", [])
-                
-                # Extract message text
-                message_text = message.get("text", "")
-                
-                # Extract response text (filter out tool invocations)
-                response_text = ""
-                for resp_part in response:
-                    if isinstance(resp_part, dict):
-                        value = resp_part.get("value", "")
-                        if value and resp_part.get("kind") != "toolInvocationSerialized":
-                            response_text += value
-                    elif isinstance(resp_part, str):
-                        response_text += resp_part
-                
-                if message_text or response_text:
-                    session_info["conversations"].append({
-                        "user": message_text,
-                        "assistant": response_text[:10000] if response_text else "",  # Truncate very long responses
-                        "request_id": request.get("requestId", "")
-                    })
+            if message_text or response_text:
+                session_info["conversations"].append({
+                    "user": message_text,
+                    "assistant": response_text[:MAX_RESPONSE_CHARS] if response_text else "",  # Truncate very long responses
+                    "request_id": request.get("requestId", "")
+                })
+        
+        if session_info["conversations"]:
+            return session_info
+        return None
             
-            if session_info["conversations"]:
-                sessions.append(session_info)
-                
-        except (json.JSONDecodeError, IOError) as e:
-            print(f"Warning: Could not parse {session_file}: {e}")
+    except (json.JSONDecodeError, IOError) as e:
+        print(f"Warning: Could not parse {session_file}: {e}")
+        return None
+
+
+def session_files(workspace_dir: Path) -> list[Path]:
+    chat_sessions_dir = workspace_dir / "chatSessions"
+    if not chat_sessions_dir.exists():
+        return []
+    return sorted(chat_sessions_dir.glob("*.json"))
+
+
+def timed_read(reader, file: Path, *args) -> tuple[Any, float, float, int]:
+    """``reader(file, *args)`` with its wall time, CPU time and the file's size."""
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    result = reader(file, *args)
+    try:
+        size = file.stat().st_size
+    except OSError:
+        size = 0
+    return result, time.perf_counter() - wall, time.process_time() - cpu, size
+
+
+def parse_chat_sessions(
+    workspace_dir: Path,
+    index: Optional[ExportIndex] = None,
+    metrics: Optional[StageMetrics] = None
+) -> list[dict[str, Any]]:
+    """Parse chat session JSON files from a workspace."""
+    sessions = []
+    for session_file in session_files(workspace_dir):
+        cached = index.lookup(session_file) if index else None
+        if cached is not None:
+            sessions.extend(cached)
             continue
-    
+        session, seconds, _, size = timed_read(parse_session_file, session_file, workspace_dir)
+        if metrics:
+            metrics.file(session_file, seconds, size)
+        if index:
+            index.store(session_file, [session] if session else [])
+        if session:
+            sessions.append(session)
     return sessions
 
 
-def read_documentation() -> list[dict[str, Any]]:
-    """Read all markdown documentation files."""
-    docs = []
+def iter_all_sessions(
+    workspaces: list[Path],
+    workers: int = 1,
+    index: Optional[ExportIndex] = None,
+    metrics: Optional[StageMetrics] = None
+) -> Iterator[dict[str, Any]]:
+    """Yield every session of every workspace, optionally parsed on a process pool.
+    
+    Session files are the unit of work, so one huge workspace still spreads
+    across cores. ``pool.map`` keeps input order, so sessions come out in the
+    same order as a sequential run: workspaces by path, then sessions by
+    filename. Files unchanged since the last indexed export are not sent to
+    the pool. Workers time each file and report it back for ``metrics``.
+    """
+    if workers <= 1:
+        for workspace in workspaces:
+            yield from parse_chat_sessions(workspace, index, metrics)
+        return
     
+    files = [(f, ws) for ws in workspaces for f in session_files(ws)]
+    cached: list[Optional[list]] = [index.lookup(f) if index else None for f, _ in files]
+    todo = [i for i, hit in enumerate(cached) if hit is None]
+    chunksize = max(1, len(todo) // (workers * 8))
+    context = multiprocessing.get_context(POOL_START_METHOD)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        parsed = pool.map(
+            timed_read,
+            repeat(parse_session_file),
+            [files[i][0] for i in todo],
+            [files[i][1] for i in todo],
+            chunksize=chunksize
+        )
+        for (session_file, _), hit in zip(files, cached):
+            if hit is None:
+                session, seconds, cpu, size = next(parsed)
+                if metrics:
+                    metrics.file(session_file, seconds, size, cpu)
+                hit = [session] if session else []
+                if index:
+                    index.store(session_file, hit)
+            yield from hit
+
+
+def parse_all_sessions(
+    workspaces: list[Path],
+    workers: int = 1,
+    index: Optional[ExportIndex] = None
+) -> list[dict[str, Any]]:
+    """Parse every session of every workspace into one list (see iter_all_sessions)."""
+    return list(iter_all_sessions(workspaces, workers, index))
+
+
+def read_doc_file(doc_file: Path) -> Optional[dict[str, Any]]:
+    try:
+        content = doc_file.read_text()
+    except IOError as e:
+        print(f"Warning: Could not read {doc_file}: {e}")
+        return None
+    
+    # Extract title from first heading
+    title_match = re.search(r'^#\s+(.+)$', content, re.MULTILINE)
+    title = title_match.group(1) if title_match else doc_file.stem
+    
+    return {
+        "filename": doc_file.name,
+        "title": title,
+        "content": content,
+        "path": str(doc_file.relative_to(PI_FLEET_ROOT)),
+        "size": len(content)
+    }
+
+
+def read_blog_post(post_file: Path) -> Optional[dict[str, Any]]:
+    try:
+        content = post_file.read_text()
+    except IOError as e:
+        print(f"Warning: Could not read {post_file}: {e}")
+        return None
+    
+    # Extract title from first heading
+    title_match = re.search(r'^#\s+(.+)$', content, re.MULTILINE)
+    title = title_match.group(1) if title_match else post_file.stem
+    
+    # Extract date from filename if present
+    date_match = re.search(r'(\d{4}-\d{2}-\d{2})', post_file.name)
+    date = date_match.group(1) if date_match else None
+    
+    return {
+        "filename": post_file.name,
+        "title": title,
+        "date": date,
+        "content": content,
+        "path": str(post_file.relative_to(PI_FLEET_ROOT))
+    }
+
+
+def read_markdown_files(
+    files: list[Path],
+    reader,
+    index: Optional[ExportIndex],
+    metrics: Optional[StageMetrics] = None
+) -> list[dict[str, Any]]:
+    """Apply ``reader`` to each file, reusing indexed records for unchanged ones."""
+    records = []
+    for file in files:
+        cached = index.lookup(file) if index else None
+        if cached is None:
+            record, seconds, _, size = timed_read(reader, file)
+            if metrics:
+                metrics.file(file, seconds, size)
+            cached = [record] if record else []
+            if index and record:
+                index.store(file, cached)
+        records.extend(cached)
+    return records
+
+
+def read_documentation(
+    index: Optional[ExportIndex] = None,
+    metrics: Optional[StageMetrics] = None
+) -> list[dict[str, Any]]:
+    """Read all markdown documentation files."""
     if not DOCS_DIR.exists():
         print(f"Warning: Docs directory not found at {DOCS_DIR}")
-        return docs
-    
-    for doc_file in sorted(DOCS_DIR.glob("*.md")):
-        try:
-            content = doc_file.read_text()
-            
-            # Extract title from first heading
-            title_match = re.search(r'^#\s+(.+)$', content, re.MULTILINE)
-            title = title_match.group(1) if title_match else doc_file.stem
-            
-            docs.append({
-                "filename": doc_file.name,
-                "title": title,
-                "content": content,
-                "path": str(doc_file.relative_to(PI_FLEET_ROOT)),
-                "size": len(content)
-            })
-        except IOError as e:
-            print(f"Warning: Could not read {doc_file}: {e}")
-            continue
+        return []
     
-    return docs
+    return read_markdown_files(sorted(DOCS_DIR.glob("*.md")), read_doc_file, index, metrics)
 
 
-def read_blog_posts() -> list[dict[str, Any]]:
+def read_blog_posts(
+    index: Optional[ExportIndex] = None,
+    metrics: Optional[StageMetrics] = None
+) -> list[dict[str, Any]]:
     """Read existing blog posts."""
-    posts = []
-    
     if not BLOG_DIR.exists():
         print(f"Warning: Blog directory not found at {BLOG_DIR}")
-        return posts
+        return []
     
-    for post_file in sorted(BLOG_DIR.glob("*.md")):
-        if post_file.name in ["README.md", "BLOG_GUIDE.md", "BLOG_NEXT_STEPS.md", "BLOG_README.md"]:
-            continue
-        
-        try:
-            content = post_file.read_text()
-            
-            # Extract title from first heading
-            title_match = re.search(r'^#\s+(.+)$', content, re.MULTILINE)
-            title = title_match.group(1) if title_match else post_file.stem
-            
-            # Extract date from filename if present
-            date_match = re.search(r'(\d{4}-\d{2}-\d{2})', post_file.name)
-            date = date_match.group(1) if date_match else None
-            
-            posts.append({
-                "filename": post_file.name,
-                "title": title,
-                "date": date,
-                "content": content,
-                "path": str(post_file.relative_to(PI_FLEET_ROOT))
-            })
-        except IOError as e:
-            print(f"Warning: Could not read {post_file}: {e}")
-            continue
+    skip = ["README.md", "BLOG_GUIDE.md", "BLOG_NEXT_STEPS.md", "BLOG_README.md"]
+    files = [f for f in sorted(BLOG_DIR.glob("*.md")) if f.name not in skip]
+    return read_markdown_files(files, read_blog_post, index, metrics)
+
+
+def iter_git_log(
+    rev_range: Optional[str] = None,
+    limit: int = 0,
+    timeout: Optional[float] = None
+) -> Iterator[dict[str, Any]]:
+    """Stream commits from ``git log``, newest first, as they are printed.
     
-    return posts
+    ``limit`` 0 reads the whole history; memory stays at one read buffer
+    plus the commit being assembled. Raises CalledProcessError if git fails
+    and TimeoutExpired if it runs longer than ``timeout`` seconds.
+    """
+    cmd = ["git", "log", "-z", f"--pretty=format:{GIT_LOG_FORMAT}"]
+    if limit:
+        cmd.append(f"--max-count={limit}")
+    if rev_range:
+        cmd.append(rev_range)
+    
+    proc = subprocess.Popen(cmd, cwd=PI_FLEET_ROOT, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    timer = threading.Timer(timeout, proc.kill) if timeout else None
+    if timer:
+        timer.start()
+    try:
+        fields: list[bytes] = []
+        pending = b""
+        while chunk := proc.stdout.read(GIT_READ_BYTES):
+            *complete, pending = (pending + chunk).split(b"\0")
+            for field in complete:
+                fields.append(field)
+                if len(fields) == GIT_LOG_FIELDS:
+                    yield git_commit(fields)
+                    fields = []
+        stderr = proc.stderr.read().decode(errors="replace")
+        proc.wait()
+        # The last commit has no trailing NUL; don't emit one cut short by a kill
+        if proc.returncode == 0 and (pending or fields):
+            yield git_commit(fields + [pending])
+    finally:
+        if timer:
+            timer.cancel()
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+        proc.stdout.close()
+        proc.stderr.close()
+    
+    if timer and proc.returncode < 0:
+        raise subprocess.TimeoutExpired(cmd, timeout)
+    if proc.returncode != 0:
+        raise subprocess.CalledProcessError(proc.returncode, cmd, stderr=stderr.strip())
+
+
+def git_commit(fields: list[bytes]) -> dict[str, Any]:
+    full_hash, date, subject, body = (
+        f.decode(errors="replace") for f in (fields + [b""] * GIT_LOG_FIELDS)[:GIT_LOG_FIELDS]
+    )
+    full_hash = full_hash.strip()
+    return {
+        "hash": full_hash[:8],
+        "full_hash": full_hash,
+        "date": date,
+        "subject": subject,
+        "body": body.rstrip()
+    }
 
 
-def get_git_history(limit: int = 200) -> list[dict[str, Any]]:
-    """Get git commit history."""
-    commits = []
+def is_ancestor(commit: str, head: str = "HEAD", timeout: Optional[float] = None) -> bool:
+    result = subprocess.run(
+        ["git", "merge-base", "--is-ancestor", commit, head],
+        cwd=PI_FLEET_ROOT,
+        capture_output=True,
+        timeout=timeout
+    )
+    return result.returncode == 0
+
+
+def get_git_history(
+    limit: int = 200,
+    timeout: Optional[float] = None,
+    cached: Optional[dict[str, Any]] = None
+) -> list[dict[str, Any]]:
+    """Get git commit history, newest first (``limit`` 0 = all commits).
     
+    ``cached`` is the ``{"head", "limit", "complete", "commits"}`` state of
+    a previous export (ExportIndex.git_history). When its head is still an
+    ancestor of HEAD and it covers ``limit``, only ``head..HEAD`` is read and
+    merged in front of the cached commits; otherwise the log is read afresh.
+    """
+    commits: list[dict[str, Any]] = []
+    rev_range = None
+    reuse = (
+        cached and cached.get("head")
+        and (cached.get("complete") or (limit and len(cached["commits"]) >= limit))
+    )
     try:
-        result = subprocess.run(
-            ["git", "log", f"--max-count={limit}", "--pretty=format:%H|%ai|%s|%b|||"],
-            cwd=PI_FLEET_ROOT,
-            capture_output=True,
-            text=True
-        )
-        
-        if result.returncode != 0:
-            print(f"Warning: Could not get git history: {result.stderr}")
-            return commits
-        
-        raw_commits = result.stdout.split("|||")
-        for raw_commit in raw_commits:
-            raw_commit = raw_commit.strip()
-            if not raw_commit:
-                continue
-            
-            parts = raw_commit.split("|", 3)
-            if len(parts) >= 3:
-                commits.append({
-                    "hash": parts[0][:8],
-                    "full_hash": parts[0],
-                    "date": parts[1],
-                    "subject": parts[2],
-                    "body": parts[3] if len(parts) > 3 else ""
-                })
+        if reuse and is_ancestor(cached["head"], timeout=timeout):
+            rev_range = f"{cached['head']}..HEAD"
+        commits.extend(iter_git_log(rev_range, limit, timeout))
     except Exception as e:
-        print(f"Warning: Could not get git history: {e}")
+        detail = e.stderr if isinstance(e, subprocess.CalledProcessError) else e
+        print(f"Warning: Could not get git history: {detail}")
+        # A partial read can't be resumed from, so keep the last good state
+        commits = cached["commits"] if rev_range else []
+        return commits[:limit] if limit else commits
     
-    return commits
+    if rev_range:
+        commits.extend(cached["commits"])
+    return commits[:limit] if limit else commits
 
 
-def get_github_issues(repo: str = "raolivei/pi-fleet", limit: int = 100) -> list[dict[str, Any]]:
-    """Fetch GitHub issues and PRs using gh CLI."""
-    issues = []
-    
+def gh_list(
+    kind: str,
+    repo: str,
+    limit: int,
+    fields: str,
+    timeout: Optional[float] = None,
+    search: Optional[str] = None
+) -> list[dict]:
+    """Run ``gh <kind> list`` for all states, optionally narrowed by ``search``."""
+    cmd = ["gh", kind, "list", "--repo", repo, "--limit", str(limit), "--state", "all", "--json", fields]
+    if search:
+        cmd += ["--search", search]
+    result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+    if result.returncode != 0:
+        raise subprocess.CalledProcessError(result.returncode, cmd, stderr=result.stderr)
+    return json.loads(result.stdout) if result.stdout.strip() else []
+
+
+def github_cache_path(repo: str) -> Path:
+    return GITHUB_CACHE_DIR / f"podcast-github-{repo.replace('/', '-')}.json"
+
+
+def load_github_cache(path: Path) -> dict[str, dict[str, dict]]:
+    """Cached ``{"issue": {number: item}, "pr": {number: item}}``, empty if unreadable."""
     try:
+        with open(path) as f:
+            cached = json.load(f)
+        return {kind: cached[kind] for kind in ("issue", "pr")}
+    except (OSError, json.JSONDecodeError, KeyError, TypeError):
+        return {"issue": {}, "pr": {}}
+
+
+def refresh_github_items(
+    kind: str,
+    repo: str,
+    fields: str,
+    cached: dict[str, dict],
+    timeout: Optional[float] = None
+) -> dict[str, dict]:
+    """Bring one kind's cached items up to date.
+    
+    Only items updated since the newest cached ``updatedAt`` are fetched and
+    merged by number. Without a cache, or when the update search hits the
+    search API's result cap, every item is listed again.
+    """
+    since = max((item.get("updatedAt") or "" for item in cached.values()), default="")
+    if since:
+        updated = gh_list(kind, repo, GH_SEARCH_CAP, fields, timeout, search=f"updated:>={since}")
+        if len(updated) < GH_SEARCH_CAP:
+            return {**cached, **{str(item["number"]): item for item in updated}}
+    return {str(item["number"]): item for item in gh_list(kind, repo, GH_FETCH_ALL, fields, timeout)}
+
+
+def get_github_issues(
+    repo: str = "raolivei/pi-fleet",
+    limit: int = 0,
+    timeout: Optional[float] = None,
+    offline: bool = False,
+    cache_path: Optional[Path] = None
+) -> list[dict[str, Any]]:
+    """Fetch GitHub issues and PRs using gh CLI, through an on-disk cache.
+    
+    Issue and PR lists are refreshed at once (see refresh_github_items) and
+    written back to ``cache_path``. ``offline``, a missing gh or a failed
+    fetch serve the cached items instead. Returns issues then PRs, newest
+    first, at most ``limit`` of each (0 = all).
+    """
+    cache_path = cache_path or github_cache_path(repo)
+    cached = load_github_cache(cache_path)
+    items = cached
+    
+    if offline:
+        if not any(cached.values()):
+            print(f"Warning: No cached GitHub issues at {cache_path}. Skipping GitHub issues.")
+    elif shutil.which("gh") is None:
         # Check if gh is available
-        result = subprocess.run(["which", "gh"], capture_output=True)
-        if result.returncode != 0:
-            print("Warning: GitHub CLI (gh) not found. Skipping GitHub issues.")
-            return issues
-        
-        # Fetch issues
-        result = subprocess.run(
-            ["gh", "issue", "list", "--repo", repo, "--limit", str(limit), 
-             "--state", "all", "--json", "number,title,body,state,createdAt,closedAt,labels"],
-            capture_output=True,
-            text=True
-        )
-        
-        if result.returncode == 0 and result.stdout:
-            issues.extend(json.loads(result.stdout))
-        
-        # Fetch PRs
-        result = subprocess.run(
-            ["gh", "pr", "list", "--repo", repo, "--limit", str(limit),
-             "--state", "all", "--json", "number,title,body,state,createdAt,mergedAt,labels"],
-            capture_output=True,
-            text=True
-        )
-        
-        if result.returncode == 0 and result.stdout:
-            prs = json.loads(result.stdout)
-            for pr in prs:
-                pr["type"] = "pr"
-            issues.extend(prs)
-            
-    except Exception as e:
-        print(f"Warning: Could not fetch GitHub issues: {e}")
+        print("Warning: GitHub CLI (gh) not found. Using cached GitHub issues.")
+    else:
+        try:
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                futures = {
+                    kind: pool.submit(refresh_github_items, kind, repo, fields, cached[kind], timeout)
+                    for kind, fields in (("issue", ISSUE_FIELDS), ("pr", PR_FIELDS))
+                }
+                items = {kind: future.result() for kind, future in futures.items()}
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = cache_path.with_suffix(".tmp")
+            with open(tmp, "w") as f:
+                json.dump({"repo": repo, "fetched_at": datetime.now().isoformat(), **items}, f)
+            tmp.replace(cache_path)
+        except Exception as e:
+            detail = e.stderr.strip() if isinstance(e, subprocess.CalledProcessError) else e
+            print(f"Warning: Could not fetch GitHub issues: {detail}. Using cached GitHub issues.")
     
+    issues = []
+    for kind in ("issue", "pr"):
+        newest = sorted(items[kind].values(), key=itemgetter("number"), reverse=True)
+        for item in newest[:limit] if limit else newest:
+            issues.append({**item, "type": "pr"} if kind == "pr" else item)
     return issues
 
 
-def categorize_content(docs: list, conversations: list) -> dict[str, list]:
-    """Categorize content by episode theme based on keywords."""
+# Episode themes and their associated keywords
+EPISODE_KEYWORDS = {
+    "01-the-beginning": [
+        "raspberry", "pi", "cluster", "hardware", "setup", "initial",
+        "flash", "install", "sd card", "boot", "first"
+    ],
+    "02-nvme-migration": [
+        "nvme", "ssd", "migration", "storage", "hat", "pcie",
+        "boot from", "disk", "drive"
+    ],
+    "03-network-nightmares": [
+        "network", "dns", "firewall", "ufw", "connectivity", "ping",
+        "ip", "ethernet", "flannel", "vxlan", "port", "router"
+    ],
+    "04-flux-bootstrap": [
+        "flux", "gitops", "bootstrap", "kustomize", "reconcile",
+        "source", "helm release", "git"
+    ],
+    "05-storage-wars": [
+        "longhorn", "storage class", "pvc", "persistent", "volume",
+        "replica", "csi", "local-path"
+    ],
+    "06-secrets-vaults": [
+        "vault", "secret", "unseal", "token", "external secrets",
+        "hashicorp", "raft"
+    ],
+    "07-ha-quest": [
+        "high availability", "ha", "control plane", "etcd", "quorum",
+        "kube-vip", "failover", "leader"
+    ],
+    "08-troubleshooting": [
+        "troubleshoot", "fix", "error", "issue", "problem", "debug",
+        "crash", "fail", "recover", "emergency"
+    ],
+    "09-monitoring-stack": [
+        "prometheus", "grafana", "monitor", "metric", "alert",
+        "dashboard", "observability", "keda"
+    ],
+    "10-production-ready": [
+        "deploy", "production", "app", "ingress", "certificate",
+        "cloudflare", "tunnel", "final"
+    ]
+}
+
+
+def trie_pattern(words: list[str]) -> str:
+    """Regex matching any of ``words``, factored into a character trie.
     
-    # Episode themes and their associated keywords
-    episode_keywords = {
-        "01-the-beginning": [
-            "raspberry", "pi", "cluster", "hardware", "setup", "initial",
-            "flash", "install", "sd card", "boot", "first"
-        ],
-        "02-nvme-migration": [
-            "nvme", "ssd", "migration", "storage", "hat", "pcie",
-            "boot from", "disk", "drive"
-        ],
-        "03-network-nightmares": [
-            "network", "dns", "firewall", "ufw", "connectivity", "ping",
-            "ip", "ethernet", "flannel", "vxlan", "port", "router"
-        ],
-        "04-flux-bootstrap": [
-            "flux", "gitops", "bootstrap", "kustomize", "reconcile",
-            "source", "helm release", "git"
-        ],
-        "05-storage-wars": [
-            "longhorn", "storage class", "pvc", "persistent", "volume",
-            "replica", "csi", "local-path"
-        ],
-        "06-secrets-vaults": [
-            "vault", "secret", "unseal", "token", "external secrets",
-            "hashicorp", "raft"
-        ],
-        "07-ha-quest": [
-            "high availability", "ha", "control plane", "etcd", "quorum",
-            "kube-vip", "failover", "leader"
-        ],
-        "08-troubleshooting": [
-            "troubleshoot", "fix", "error", "issue", "problem", "debug",
-            "crash", "fail", "recover", "emergency"
-        ],
-        "09-monitoring-stack": [
-            "prometheus", "grafana", "monitor", "metric", "alert",
-            "dashboard", "observability", "keda"
-        ],
-        "10-production-ready": [
-            "deploy", "production", "app", "ingress", "certificate",
-            "cloudflare", "tunnel", "final"
-        ]
-    }
+    Optional tails are greedy, so the match is always the longest word
+    starting at the current position.
+    """
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+    
+    def build(node: dict) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" not in node:
+            return body
+        return (body if len(branches) > 1 else "(?:" + body + ")") + "?"
+    
+    return build(trie)
+
+
+class KeywordMatcher:
+    """Scores every episode in a single pass over the text.
     
-    categorized = {key: [] for key in episode_keywords.keys()}
-    categorized["uncategorized"] = []
+    With pyahocorasick the keywords form an Aho-Corasick automaton that
+    reports every (overlapping) occurrence. Otherwise they are compiled into
+    one trie regex inside a lookahead, which stops at each position once and
+    takes the longest keyword starting there; every keyword that is a prefix
+    of that match starts there too. Either way hit counts are exact
+    occurrence counts, and an episode's score is the number of its keywords
+    with at least one hit - the same as a ``kw in text`` check per keyword.
     
-    def find_category(text: str) -> str:
-        text_lower = text.lower()
+    ``related_docs`` maps doc filenames straight to an episode.
+    """
+    
+    def __init__(
+        self,
+        episode_keywords: dict[str, list[str]],
+        related_docs: Optional[dict[str, str]] = None
+    ):
+        self.related_docs = related_docs or {}
+        self.episode_keywords = {
+            episode: [kw.lower() for kw in keywords if kw]
+            for episode, keywords in episode_keywords.items()
+        }
+        keywords = sorted({kw for kws in self.episode_keywords.values() for kw in kws})
+        self.automaton = None
+        self.pattern = None
+        self.prefixes: dict[str, list[str]] = {}
+        if keywords and HAS_AHOCORASICK:
+            self.automaton = ahocorasick.Automaton()
+            for kw in keywords:
+                self.automaton.add_word(kw, kw)
+            self.automaton.make_automaton()
+        elif keywords:
+            self.pattern = re.compile("(?=(" + trie_pattern(keywords) + "))")
+            self.prefixes = {kw: [k for k in keywords if kw.startswith(k)] for kw in keywords}
+        # Keyword hits summed per winning episode, for the export summary
+        self.totals: dict[str, dict[str, int]] = {}
+    
+    def compiled(self) -> dict[str, Any]:
+        """Plain-data form for the on-disk cache (no reference to this class)."""
+        return {
+            "episode_keywords": self.episode_keywords,
+            "related_docs": self.related_docs,
+            "automaton": self.automaton,
+            "pattern": self.pattern.pattern if self.pattern is not None else None,
+            "prefixes": self.prefixes
+        }
+    
+    @classmethod
+    def from_compiled(cls, compiled: dict[str, Any]) -> "KeywordMatcher":
+        matcher = cls.__new__(cls)
+        matcher.episode_keywords = compiled["episode_keywords"]
+        matcher.related_docs = compiled["related_docs"]
+        matcher.automaton = compiled["automaton"]
+        matcher.pattern = re.compile(compiled["pattern"]) if compiled["pattern"] else None
+        matcher.prefixes = compiled["prefixes"]
+        matcher.totals = {}
+        return matcher
+    
+    @property
+    def episodes(self) -> list[str]:
+        return [*self.episode_keywords, "uncategorized"]
+    
+    def hits(self, text: str) -> dict[str, int]:
+        """Occurrences of every keyword found in ``text`` (case-insensitive)."""
+        if self.automaton is not None:
+            return dict(Counter(map(itemgetter(1), self.automaton.iter(text.lower()))))
+        if self.pattern is None:
+            return {}
+        longest = Counter(self.pattern.findall(text.lower()))
+        hits: dict[str, int] = {}
+        for match, n in longest.items():
+            for kw in self.prefixes[match]:
+                hits[kw] = hits.get(kw, 0) + n
+        return hits
+    
+    def categorize(self, text: str) -> str:
+        """Episode with the most distinct keyword hits, or "uncategorized"."""
+        hits = self.hits(text)
         scores = {}
-        
-        for episode, keywords in episode_keywords.items():
-            score = sum(1 for kw in keywords if kw in text_lower)
+        for episode, keywords in self.episode_keywords.items():
+            score = sum(1 for kw in keywords if kw in hits)
             if score > 0:
                 scores[episode] = score
         
-        if scores:
-            return max(scores, key=scores.get)
-        return "uncategorized"
+        if not scores:
+            return "uncategorized"
+        
+        episode = max(scores, key=scores.get)
+        totals = self.totals.setdefault(episode, {})
+        for kw in self.episode_keywords[episode]:
+            if kw in hits:
+                totals[kw] = totals.get(kw, 0) + hits[kw]
+        return episode
+    
+    def top_keywords(self, episode: str, n: int = 3) -> list[tuple[str, int]]:
+        totals = self.totals.get(episode, {})
+        return sorted(totals.items(), key=lambda kv: -kv[1])[:n]
+
+
+def load_config(config_path: Path) -> dict:
+    """Load episode configuration from YAML or JSON."""
+    with open(config_path) as f:
+        content = f.read()
+    
+    if config_path.suffix == ".json":
+        return json.loads(content)
+    if not HAS_YAML:
+        raise ValueError("PyYAML not installed (pip3 install pyyaml)")
+    return yaml.safe_load(content)
+
+
+def config_matcher(config: dict) -> Optional[KeywordMatcher]:
+    """Matcher for the ``episodes`` of a config, or None if it defines none."""
+    episodes = config.get("episodes") or []
+    if not episodes:
+        return None
+    
+    episode_keywords = {ep["id"]: ep.get("keywords") or [] for ep in episodes}
+    related_docs: dict[str, str] = {}
+    for ep in episodes:
+        for filename in ep.get("related_docs") or []:
+            related_docs.setdefault(filename, ep["id"])
+    return KeywordMatcher(episode_keywords, related_docs)
+
+
+def build_matcher(config_path: Optional[Path]) -> KeywordMatcher:
+    """Episode matcher from ``config_path``, reusing the compiled copy on disk.
+    
+    The cache is keyed by the config and this script, so editing either
+    rebuilds it. Without a readable config the built-in EPISODE_KEYWORDS
+    are used.
+    """
+    if not config_path or not config_path.exists():
+        if config_path:
+            print(f"Warning: Config not found at {config_path}, using built-in keywords")
+        return KeywordMatcher(EPISODE_KEYWORDS)
+    
+    digest = hashlib.sha256(config_path.read_bytes())
+    digest.update(Path(__file__).read_bytes())
+    digest.update(b"ahocorasick" if HAS_AHOCORASICK else b"re")
+    key = digest.hexdigest()
+    
+    try:
+        with open(MATCHER_CACHE, "rb") as f:
+            cached = pickle.load(f)
+        if cached.get("key") == key:
+            matcher = KeywordMatcher.from_compiled(cached["matcher"])
+            print(f"[*] Episodes: {len(matcher.episode_keywords)} from {config_path.name} (cached matcher)")
+            return matcher
+    except (OSError, pickle.UnpicklingError, EOFError, KeyError, ImportError):
+        pass
+    
+    try:
+        matcher = config_matcher(load_config(config_path))
+    except Exception as e:
+        print(f"Warning: Could not load {config_path}: {e}; using built-in keywords")
+        return KeywordMatcher(EPISODE_KEYWORDS)
+    if matcher is None:
+        print(f"Warning: No episodes in {config_path}, using built-in keywords")
+        return KeywordMatcher(EPISODE_KEYWORDS)
+    
+    try:
+        MATCHER_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        tmp = MATCHER_CACHE.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump({"key": key, "matcher": matcher.compiled()}, f)
+        tmp.replace(MATCHER_CACHE)
+    except (OSError, pickle.PicklingError) as e:
+        print(f"Warning: Could not cache matcher: {e}")
+    print(f"[*] Episodes: {len(matcher.episode_keywords)} from {config_path.name} (compiled)")
+    return matcher
+
+
+def category_text(item: dict, source_type: str, full_text: bool = False) -> str:
+    """Text a doc or chat session is categorized by.
+    
+    By default only the head of each item is scanned (500 characters of a
+    doc, 2000 of a session); ``full_text`` scans all of it.
+    """
+    if source_type == "documentation":
+        content = item.get("content", "")
+        return item["title"] + " " + (content if full_text else content[:500])
+    
+    combined_text = ""
+    for c in item.get("conversations", []):
+        assistant = c.get("assistant", "")
+        combined_text += c.get("user", "") + " " + (assistant if full_text else assistant[:500])
+    return combined_text if full_text else combined_text[:2000]
+
+
+def categorize_item(
+    item: dict,
+    source_type: str,
+    matcher: KeywordMatcher,
+    full_text: bool = False
+) -> str:
+    """Tag a doc or chat session with its source type and return its episode."""
+    item["source_type"] = source_type
+    if source_type == "documentation" and item.get("filename") in matcher.related_docs:
+        return matcher.related_docs[item["filename"]]
+    return matcher.categorize(category_text(item, source_type, full_text))
+
+
+def categorize_content(
+    docs: list,
+    conversations: list,
+    matcher: Optional[KeywordMatcher] = None,
+    full_text: bool = False
+) -> dict[str, list]:
+    """Categorize content by episode theme based on keywords."""
+    matcher = matcher or KeywordMatcher(EPISODE_KEYWORDS)
+    categorized = {key: [] for key in matcher.episodes}
     
     # Categorize documentation
     for doc in docs:
-        category = find_category(doc["title"] + " " + doc.get("content", "")[:500])
-        doc["source_type"] = "documentation"
-        categorized[category].append(doc)
+        categorized[categorize_item(doc, "documentation", matcher, full_text)].append(doc)
     
     # Categorize conversations
     for conv in conversations:
-        combined_text = ""
-        for c in conv.get("conversations", []):
-            combined_text += c.get("user", "") + " " + c.get("assistant", "")[:500]
-        
-        category = find_category(combined_text[:2000])
-        conv["source_type"] = "conversation"
-        categorized[category].append(conv)
+        categorized[categorize_item(conv, "conversation", matcher, full_text)].append(conv)
     
     return categorized
 
 
-def export_data(output_dir: Path, include_github: bool = True) -> dict[str, Any]:
-    """Export all data sources."""
+def run_stage(metrics: StageMetrics, stage: str, fn, *args, **kwargs) -> list:
+    """Call ``fn`` as ``stage`` of ``metrics``, counting the records it returns."""
+    with metrics.stage(stage) as entry:
+        records = fn(*args, **kwargs)
+        entry["items"] = len(records)
+    return records
+
+
+def record_id(shard: str, record: dict) -> str:
+    """Stable ID for a record in the sharded export, e.g. ``commit:<hash>``."""
+    if shard == "chat_sessions":
+        return f"session:{Path(record['workspace']).name}/{record['session_id']}"
+    if shard == "documentation":
+        return f"doc:{record['path']}"
+    if shard == "blog_posts":
+        return f"blog:{record['path']}"
+    if shard == "git_history":
+        return f"commit:{record['full_hash']}"
+    return f"{record.get('type', 'issue')}:{record['number']}"
+
+
+def dedup_text(shard: str, record: dict) -> str:
+    """Whitespace-normalized, lowercased text a record is deduplicated on."""
+    if shard == "chat_sessions":
+        text = " ".join(
+            c.get("user", "") + " " + c.get("assistant", "")
+            for c in record.get("conversations", [])
+        )
+    else:
+        text = record.get("content", "")
+    return " ".join(text.lower().split())
+
+
+def shingles(text: str, size: int = SHINGLE_WORDS) -> set[int]:
+    """CRC32 hashes of every ``size``-word window of ``text``."""
+    words = text.split()
+    if len(words) <= size:
+        return {zlib.crc32(text.encode())}
+    return {
+        zlib.crc32(" ".join(words[i:i + size]).encode())
+        for i in range(len(words) - size + 1)
+    }
+
+
+class Deduplicator:
+    """Collapses exact and near-duplicate records into one canonical copy.
+    
+    Exact duplicates share a hash of their normalized text (see
+    dedup_text). Near duplicates are found from word shingles: a record's
+    smallest few shingle hashes act as anchors (a bottom-k MinHash sketch),
+    records sharing an anchor become candidates, and a candidate is a
+    duplicate when the Jaccard similarity of the full shingle sets reaches
+    the threshold. The canonical copy sits at the first member's position,
+    carries the longest member's content and lists every member's ID in
+    ``sources``.
+    """
+    
+    def __init__(self, threshold: float = NEAR_DUP_JACCARD):
+        self.threshold = threshold
+        self.dropped: dict[str, int] = {}
+        self.near: dict[str, int] = {}
+    
+    def unique(self, shard: str, records: list[dict]) -> list[dict]:
+        groups: list[list[int]] = []
+        group_shingles: list[set[int]] = []
+        by_digest: dict[bytes, int] = {}
+        anchors: dict[int, list[int]] = {}
+        lengths = []
+        
+        for i, record in enumerate(records):
+            text = dedup_text(shard, record)
+            lengths.append(len(text))
+            digest = hashlib.sha1(text.encode()).digest()
+            group = by_digest.get(digest)
+            
+            if group is None:
+                record_shingles = shingles(text)
+                sketch = heapq.nsmallest(SHINGLE_ANCHORS, record_shingles)
+                candidates = sorted({g for a in sketch for g in anchors.get(a, ())})
+                for g in candidates:
+                    other = group_shingles[g]
+                    overlap = len(record_shingles & other)
+                    if overlap >= self.threshold * (len(record_shingles) + len(other) - overlap):
+                        group = g
+                        self.near[shard] = self.near.get(shard, 0) + 1
+                        break
+                if group is None:
+                    group = len(groups)
+                    groups.append([])
+                    group_shingles.append(record_shingles)
+                    for a in sketch:
+                        anchors.setdefault(a, []).append(group)
+                by_digest[digest] = group
+            
+            groups[group].append(i)
+        
+        unique = []
+        for members in groups:
+            if len(members) == 1:
+                unique.append(records[members[0]])
+                continue
+            longest = max(members, key=lambda i: lengths[i])
+            canonical = dict(records[longest])
+            canonical["sources"] = [record_id(shard, records[i]) for i in members]
+            unique.append(canonical)
+        self.dropped[shard] = self.dropped.get(shard, 0) + len(records) - len(unique)
+        return unique
+    
+    def report(self, shard: str, noun: str) -> str:
+        return f"{self.dropped.get(shard, 0)} {noun} ({self.near.get(shard, 0)} near-duplicates)"
+
+
+class ShardedExport:
+    """JSON Lines export: one shard per source, every record written once.
+    
+    Records gain an ``id`` and are appended to ``shards/<source>.jsonl`` as
+    soon as they are produced. ``categories.json`` maps each episode to the
+    IDs of its docs and conversations instead of copying them,
+    ``offsets.json`` maps every ID to ``[shard, byte offset, length]`` for
+    random access, and ``manifest.json`` describes the shards.
+    """
+    
+    def __init__(self, output_dir: Path, episodes: list[str]):
+        self.output_dir = output_dir
+        (output_dir / SHARDS_DIR).mkdir(parents=True, exist_ok=True)
+        self.files = {
+            name: open(output_dir / SHARDS_DIR / f"{name}.jsonl", "wb")
+            for name in SHARD_NAMES
+        }
+        self.counts = {name: 0 for name in SHARD_NAMES}
+        self.sizes = {name: 0 for name in SHARD_NAMES}
+        self.offsets: dict[str, list] = {}
+        # Per-source so docs still precede conversations in each episode
+        self.categories = {
+            name: {key: [] for key in episodes}
+            for name in ("documentation", "chat_sessions")
+        }
+    
+    def write(self, shard: str, record: dict, category: Optional[str] = None) -> str:
+        """Append one record to its shard and return its ID."""
+        rid = record_id(shard, record)
+        line = (json.dumps({"id": rid, **record}, default=str) + "\n").encode()
+        self.files[shard].write(line)
+        self.offsets[rid] = [shard, self.sizes[shard], len(line)]
+        self.counts[shard] += 1
+        self.sizes[shard] += len(line)
+        if category:
+            self.categories[shard][category].append(rid)
+        return rid
+    
+    def episode_ids(self) -> dict[str, list[str]]:
+        docs = self.categories["documentation"]
+        sessions = self.categories["chat_sessions"]
+        return {episode: docs[episode] + sessions[episode] for episode in docs}
+    
+    def close(self, metadata: dict) -> dict[str, Any]:
+        """Close the shards and write categories, offsets and manifest."""
+        for f in self.files.values():
+            f.close()
+        
+        with open(self.output_dir / CATEGORIES_FILE, "w") as f:
+            json.dump(self.episode_ids(), f, indent=2)
+        
+        with open(self.output_dir / OFFSETS_FILE, "w") as f:
+            json.dump(self.offsets, f)
+        
+        manifest = {
+            "format": "jsonl",
+            "version": 1,
+            "metadata": metadata,
+            "shards": {
+                name: {
+                    "path": f"{SHARDS_DIR}/{name}.jsonl",
+                    "records": self.counts[name],
+                    "bytes": self.sizes[name]
+                }
+                for name in SHARD_NAMES
+            },
+            "categories": CATEGORIES_FILE,
+            "offsets": OFFSETS_FILE
+        }
+        with open(self.output_dir / MANIFEST_FILE, "w") as f:
+            json.dump(manifest, f, indent=2, default=str)
+        return manifest
+
+
+def remove_other_format(output_dir: Path, output_format: str) -> list[str]:
+    """Delete another format's export files from ``output_dir``; returns their names."""
+    removed = []
+    for other, names in FORMAT_FILES.items():
+        if other == output_format:
+            continue
+        for name in names:
+            path = output_dir / name
+            if path.is_dir():
+                shutil.rmtree(path)
+            elif path.exists():
+                path.unlink()
+            else:
+                continue
+            removed.append(name)
+    return removed
+
+
+def export_data(
+    output_dir: Path,
+    include_github: bool = True,
+    workers: int = 1,
+    incremental: bool = False,
+    output_format: str = "json",
+    full_text: bool = False,
+    config_path: Optional[Path] = CONFIG_FILE,
+    sqlite: bool = False,
+    dedup: bool = False,
+    stage_timeouts: Optional[dict[str, float]] = None,
+    git_limit: int = 200,
+    github_limit: int = 0,
+    offline: bool = False
+) -> dict[str, Any]:
+    """Export all data sources.
+    
+    ``output_format="json"`` writes raw-export.json plus episodes/*.json;
+    ``"jsonl"`` streams records into shards instead (see ShardedExport).
+    Returns the export dict or, for jsonl, the manifest. ``full_text``
+    categorizes on whole items instead of their first few hundred characters.
+    Episodes come from ``config_path`` (built-in keywords if it is missing).
+    ``sqlite`` also upserts every record into export.db (see store.py).
+    ``dedup`` collapses duplicate sessions, docs and blog posts (see
+    Deduplicator); sessions are then collected before being written.
+    
+    git and gh run on background threads while the file stages parse, so
+    wall time tends to the slowest stage rather than the sum. Each is killed
+    after its ``stage_timeouts`` entry (default STAGE_TIMEOUTS).
+    
+    ``git_limit`` caps the commits exported (0 = full history). With
+    ``incremental`` only commits since the last export are read from git.
+    Issues/PRs come through the GitHub cache; ``offline`` skips gh entirely.
+    
+    Per-stage metrics (see StageMetrics) go to the summary and metrics.json.
+    """
     
     print("=" * 60)
     print("Eldertree Podcast Export Tool")
     print("=" * 60)
     
+    index = ExportIndex(output_dir / INDEX_FILE) if incremental else None
+    matcher = build_matcher(config_path)
+    sharded = ShardedExport(output_dir, matcher.episodes) if output_format == "jsonl" else None
+    deduplicator = Deduplicator() if dedup else None
+    store = None
+    if sqlite:
+        if has_fts5():
+            output_dir.mkdir(parents=True, exist_ok=True)
+            store = ExportStore(output_dir / STORE_FILE)
+        else:
+            print("Warning: This Python's SQLite has no FTS5. Skipping --sqlite.")
+    
+    def emit(shard: str, record: dict, category: Optional[str] = None) -> None:
+        if sharded:
+            sharded.write(shard, record, category)
+        if store:
+            store.upsert(shard, record_id(shard, record), record, category)
+    
+    # Subprocess-backed collectors run in the background from the start
+    timeouts = {**STAGE_TIMEOUTS, **(stage_timeouts or {})}
+    metrics = StageMetrics()
+    collectors = ThreadPoolExecutor(max_workers=2, thread_name_prefix="collect")
+    git_cache = index.git_history if index else None
+    git_future = collectors.submit(
+        run_stage, metrics, "git_history", get_git_history,
+        git_limit, timeout=timeouts["git_history"], cached=git_cache
+    )
+    github_future = None
+    if include_github:
+        github_future = collectors.submit(
+            run_stage, metrics, "github_issues", get_github_issues,
+            limit=github_limit, timeout=timeouts["github_issues"], offline=offline
+        )
+    collectors.shutdown(wait=False)
+    
     # Find relevant workspaces
     print("\n[1/6] Finding Cursor workspaces...")
-    workspaces = find_relevant_workspaces()
+    workspaces = run_stage(metrics, "workspaces", find_relevant_workspaces, workers)
     print(f"      Found {len(workspaces)} relevant workspaces")
     
     # Parse chat sessions
     print("\n[2/6] Parsing chat sessions...")
     all_sessions = []
-    for workspace in workspaces:
-        sessions = parse_chat_sessions(workspace)
-        all_sessions.extend(sessions)
-    print(f"      Parsed {len(all_sessions)} chat sessions")
-    
-    total_conversations = sum(len(s.get("conversations", [])) for s in all_sessions)
+    session_categories = []
+    session_count = 0
+    total_conversations = 0
+    with metrics.stage("chat_sessions") as stage:
+        sessions = iter_all_sessions(workspaces, workers, index, metrics)
+        if deduplicator:
+            sessions = deduplicator.unique("chat_sessions", list(sessions))
+        for session in sessions:
+            session_count += 1
+            total_conversations += len(session.get("conversations", []))
+            category = categorize_item(session, "conversation", matcher, full_text)
+            emit("chat_sessions", session, category)
+            if not sharded:
+                all_sessions.append(session)
+                session_categories.append(category)
+        stage["items"] = session_count
+    print(f"      Parsed {session_count} chat sessions")
+    if deduplicator:
+        print(f"      Dropped duplicates: {deduplicator.report('chat_sessions', 'sessions')}")
     print(f"      Total conversations: {total_conversations}")
     
     # Read documentation
     print("\n[3/6] Reading documentation...")
-    docs = read_documentation()
+    with metrics.stage("documentation") as stage:
+        docs = read_documentation(index, metrics)
+        if deduplicator:
+            docs = deduplicator.unique("documentation", docs)
+        stage["items"] = len(docs)
     print(f"      Found {len(docs)} documentation files")
+    if deduplicator:
+        print(f"      Dropped duplicates: {deduplicator.report('documentation', 'docs')}")
     
     # Read blog posts
     print("\n[4/6] Reading blog posts...")
-    blog_posts = read_blog_posts()
+    with metrics.stage("blog_posts") as stage:
+        blog_posts = read_blog_posts(index, metrics)
+        if deduplicator:
+            blog_posts = deduplicator.unique("blog_posts", blog_posts)
+        stage["items"] = len(blog_posts)
     print(f"      Found {len(blog_posts)} blog posts")
+    if deduplicator:
+        print(f"      Dropped duplicates: {deduplicator.report('blog_posts', 'blog posts')}")
+    
+    doc_categories = [categorize_item(doc, "documentation", matcher, full_text) for doc in docs]
+    for doc, category in zip(docs, doc_categories):
+        emit("documentation", doc, category)
+    for post in blog_posts:
+        emit("blog_posts", post)
     
-    # Get git history
+    # Get git history (started in the background above)
     print("\n[5/6] Getting git history...")
-    git_history = get_git_history()
-    print(f"      Found {len(git_history)} commits")
+    git_history = git_future.result()
+    if git_cache and git_cache.get("head"):
+        new_commits = next(
+            (n for n, c in enumerate(git_history) if c["full_hash"] == git_cache["head"]),
+            len(git_history)
+        )
+        print(f"      Found {len(git_history)} commits ({new_commits} new since last export)")
+    else:
+        print(f"      Found {len(git_history)} commits")
+    if index:
+        index.git_history = {
+            "head": git_history[0]["full_hash"] if git_history else None,
+            "limit": git_limit,
+            "complete": not git_limit or len(git_history) < git_limit,
+            "commits": git_history
+        }
     
     # Get GitHub issues
     github_issues = []
-    if include_github:
+    if github_future:
         print("\n[6/6] Fetching GitHub issues...")
-        github_issues = get_github_issues()
+        github_issues = github_future.result()
         print(f"      Found {len(github_issues)} issues/PRs")
     else:
         print("\n[6/6] Skipping GitHub issues (disabled)")
     
+    for commit in git_history:
+        emit("git_history", commit)
+    for issue in github_issues:
+        emit("github_issues", issue)
+    
+    collection_seconds = metrics.wall_seconds()
+    print(f"\n[*] Collected in {collection_seconds:.2f}s: " + ", ".join(
+        f"{stage} {entry['wall_seconds']:.2f}s" for stage, entry in metrics.stages.items()
+    ))
+    
+    if index:
+        index.save()
+        print(f"\n[*] Incremental: reused {index.reused} unchanged files, parsed {index.parsed}")
+    
     # Categorize content
     print("\n[*] Categorizing content by episode theme...")
-    categorized = categorize_content(docs, all_sessions)
-    
-    for episode, items in categorized.items():
-        if items:
-            print(f"      {episode}: {len(items)} items")
-    
-    # Prepare export data
-    export = {
-        "metadata": {
-            "exported_at": datetime.now().isoformat(),
-            "pi_fleet_root": str(PI_FLEET_ROOT),
-            "cursor_storage": str(CURSOR_STORAGE),
-            "stats": {
-                "workspaces": len(workspaces),
-                "chat_sessions": len(all_sessions),
-                "conversations": total_conversations,
-                "documentation_files": len(docs),
-                "blog_posts": len(blog_posts),
-                "git_commits": len(git_history),
-                "github_issues": len(github_issues)
-            }
-        },
-        "chat_sessions": all_sessions,
-        "documentation": docs,
-        "blog_posts": blog_posts,
-        "git_history": git_history,
-        "github_issues": github_issues,
-        "categorized_by_episode": categorized
+    if sharded:
+        episode_counts = {episode: len(ids) for episode, ids in sharded.episode_ids().items()}
+    else:
+        categorized = {key: [] for key in matcher.episodes}
+        for item, category in [*zip(docs, doc_categories), *zip(all_sessions, session_categories)]:
+            categorized[category].append(item)
+        episode_counts = {episode: len(items) for episode, items in categorized.items()}
+    
+    for episode, count in episode_counts.items():
+        if count:
+            print(f"      {episode}: {count} items")
+    
+    metadata = {
+        "exported_at": datetime.now().isoformat(),
+        "pi_fleet_root": str(PI_FLEET_ROOT),
+        "cursor_storage": str(CURSOR_STORAGE),
+        "stats": {
+            "workspaces": len(workspaces),
+            "chat_sessions": session_count,
+            "conversations": total_conversations,
+            "documentation_files": len(docs),
+            "blog_posts": len(blog_posts),
+            "git_commits": len(git_history),
+            "github_issues": len(github_issues)
+        }
     }
+    if deduplicator:
+        metadata["stats"]["duplicates_removed"] = deduplicator.dropped
+    metadata["stage_seconds"] = {
+        stage: round(entry["wall_seconds"], 3) for stage, entry in metrics.stages.items()
+    }
+    metadata["collection_seconds"] = round(collection_seconds, 3)
     
     # Create output directory
     output_dir.mkdir(parents=True, exist_ok=True)
     
-    # Write main export file
-    main_export_file = output_dir / "raw-export.json"
-    with open(main_export_file, "w") as f:
-        json.dump(export, f, indent=2, default=str)
-    print(f"\n[✓] Main export saved to: {main_export_file}")
-    
-    # Write categorized episode data
-    episodes_dir = output_dir / "episodes"
-    episodes_dir.mkdir(exist_ok=True)
-    
-    for episode_name, items in categorized.items():
-        if not items:
-            continue
+    with metrics.stage("write") as stage:
+        if sharded:
+            export = sharded.close(metadata)
+            print(f"\n[✓] Shards saved to: {output_dir / SHARDS_DIR}")
+            print(f"[✓] Manifest saved to: {output_dir / MANIFEST_FILE}")
+        else:
+            # Prepare export data
+            export = {
+                "metadata": metadata,
+                "chat_sessions": all_sessions,
+                "documentation": docs,
+                "blog_posts": blog_posts,
+                "git_history": git_history,
+                "github_issues": github_issues,
+                "categorized_by_episode": categorized
+            }
+            
+            # Write main export file
+            main_export_file = output_dir / "raw-export.json"
+            with open(main_export_file, "w") as f:
+                json.dump(export, f, indent=2, default=str)
+            print(f"\n[✓] Main export saved to: {main_export_file}")
+            
+            # Write categorized episode data
+            episodes_dir = output_dir / "episodes"
+            episodes_dir.mkdir(exist_ok=True)
+            
+            for episode_name, items in categorized.items():
+                if not items:
+                    continue
+                
+                episode_file = episodes_dir / f"{episode_name}.json"
+                with open(episode_file, "w") as f:
+                    json.dump({
+                        "episode": episode_name,
+                        "item_count": len(items),
+                        "items": items
+                    }, f, indent=2, default=str)
+            
+            print(f"[✓] Episode data saved to: {episodes_dir}")
         
-        episode_file = episodes_dir / f"{episode_name}.json"
-        with open(episode_file, "w") as f:
-            json.dump({
-                "episode": episode_name,
-                "item_count": len(items),
-                "items": items
-            }, f, indent=2, default=str)
-    
-    print(f"[✓] Episode data saved to: {episodes_dir}")
+        stale = remove_other_format(output_dir, output_format)
+        if stale:
+            print(f"[✓] Removed stale {'json' if sharded else 'jsonl'} export: {', '.join(stale)}")
+        
+        if store:
+            written, unchanged = store.written, store.unchanged
+            pruned = store.close()
+            print(f"[✓] SQLite store saved to: {output_dir / STORE_FILE} "
+                  f"({written} records written, {unchanged} unchanged, {pruned} removed)")
+        
+        stage["items"] = (session_count + len(docs) + len(blog_posts)
+                          + len(git_history) + len(github_issues))
     
     # Write summary
     summary_file = output_dir / "EXPORT_SUMMARY.md"
@@ -461,21 +1540,47 @@ def export_data(output_dir: Path, include_github: bool = True) -> dict[str, Any]
         f.write("# Eldertree Podcast Export Summary\n\n")
         f.write(f"**Exported:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
         f.write("## Statistics\n\n")
-        f.write(f"- Chat Sessions: {len(all_sessions)}\n")
+        f.write(f"- Chat Sessions: {session_count}\n")
         f.write(f"- Total Conversations: {total_conversations}\n")
         f.write(f"- Documentation Files: {len(docs)}\n")
         f.write(f"- Blog Posts: {len(blog_posts)}\n")
         f.write(f"- Git Commits: {len(git_history)}\n")
-        f.write(f"- GitHub Issues/PRs: {len(github_issues)}\n\n")
-        f.write("## Content by Episode\n\n")
-        for episode, items in categorized.items():
-            if items:
-                f.write(f"- **{episode}**: {len(items)} items\n")
+        f.write(f"- GitHub Issues/PRs: {len(github_issues)}\n")
+        if deduplicator:
+            f.write(f"- Duplicates Removed: {deduplicator.report('chat_sessions', 'sessions')}, "
+                    f"{deduplicator.report('documentation', 'docs')}, "
+                    f"{deduplicator.report('blog_posts', 'blog posts')}\n")
+        f.write("\n")
+        f.write("## Stage Metrics\n\n")
+        f.write(metrics.markdown())
+        f.write("\n## Content by Episode\n\n")
+        for episode, count in episode_counts.items():
+            if count:
+                top = ", ".join(f"{kw} ×{n}" for kw, n in matcher.top_keywords(episode))
+                suffix = f" (top keywords: {top})" if top else ""
+                f.write(f"- **{episode}**: {count} items{suffix}\n")
         f.write("\n## Files Generated\n\n")
-        f.write("- `raw-export.json` - Complete export data\n")
-        f.write("- `episodes/*.json` - Data categorized by episode theme\n")
+        if sharded:
+            f.write(f"- `{SHARDS_DIR}/*.jsonl` - One JSON record per line, per source\n")
+            f.write(f"- `{CATEGORIES_FILE}` - Record IDs categorized by episode theme\n")
+            f.write(f"- `{OFFSETS_FILE}` - Shard and byte range of every record ID\n")
+            f.write(f"- `{MANIFEST_FILE}` - Shard paths, record counts and sizes\n")
+        else:
+            f.write("- `raw-export.json` - Complete export data\n")
+            f.write("- `episodes/*.json` - Data categorized by episode theme\n")
+        if store:
+            f.write(f"- `{STORE_FILE}` - SQLite tables with FTS5 keyword search\n")
+        f.write(f"- `{METRICS_FILE}` - Per-stage time, I/O and memory (the table above)\n")
+        if index:
+            f.write(f"- `{INDEX_FILE}` - Fingerprints for incremental exports "
+                    f"({index.reused} files reused, {index.parsed} parsed this run)\n")
     
     print(f"[✓] Summary saved to: {summary_file}")
+    
+    metrics_file = output_dir / METRICS_FILE
+    with open(metrics_file, "w") as f:
+        json.dump(metrics.report(), f, indent=2)
+    print(f"[✓] Metrics saved to: {metrics_file}")
     print("\n" + "=" * 60)
     print("Export complete!")
     print("=" * 60)
@@ -501,12 +1606,105 @@ def main():
     parser.add_argument(
         "--config", "-c",
         type=Path,
-        help="Path to config.yaml for episode definitions"
+        default=CONFIG_FILE,
+        help="Path to config.yaml for episode definitions (keywords, related_docs)"
+    )
+    parser.add_argument(
+        "--workers", "-j",
+        type=int,
+        default=1,
+        help="Parallel workers for workspace discovery and session parsing "
+             f"(default: 1, this machine has {os.cpu_count()} CPUs)"
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Reuse records for files unchanged since the last export and only read new "
+             f"commits ({INDEX_FILE} in the output dir)"
+    )
+    parser.add_argument(
+        "--format",
+        choices=["json", "jsonl"],
+        default="json",
+        help="json: raw-export.json plus episodes/*.json; "
+             "jsonl: per-source JSON Lines shards with categories.json and manifest.json"
+    )
+    parser.add_argument(
+        "--full-text",
+        action="store_true",
+        help="Categorize on the full text of docs and sessions, not just the first 500/2000 characters"
+    )
+    parser.add_argument(
+        "--sqlite",
+        action="store_true",
+        help=f"Also upsert all records into {STORE_FILE} (SQLite + FTS5) in the output dir"
+    )
+    parser.add_argument(
+        "--github-limit",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Export at most N issues and N PRs, 0 for all (default: 0)"
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Use cached GitHub issues/PRs without calling gh"
+    )
+    parser.add_argument(
+        "--git-limit",
+        type=int,
+        default=200,
+        metavar="N",
+        help="Export at most N recent commits, 0 for the full history (default: 200)"
+    )
+    parser.add_argument(
+        "--stage-timeout",
+        type=float,
+        metavar="SECONDS",
+        help="Kill git/gh after this many seconds "
+             f"(default: {STAGE_TIMEOUTS['git_history']}s git, {STAGE_TIMEOUTS['github_issues']}s gh)"
+    )
+    parser.add_argument(
+        "--dedup",
+        action="store_true",
+        help="Keep one copy of sessions, docs and blog posts repeated across workspaces "
+             f"(exact or >= {NEAR_DUP_JACCARD:.0%} shingle overlap), listing the others in 'sources'"
+    )
+    
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help=f"Run the export under cProfile and write {PROFILE_FILE} to the output dir"
     )
     
     args = parser.parse_args()
     
-    export_data(args.output, include_github=not args.no_github)
+    options = dict(
+        include_github=not args.no_github,
+        workers=max(1, args.workers),
+        incremental=args.incremental,
+        output_format=args.format,
+        full_text=args.full_text,
+        config_path=args.config,
+        sqlite=args.sqlite,
+        dedup=args.dedup,
+        git_limit=args.git_limit,
+        github_limit=args.github_limit,
+        offline=args.offline,
+        stage_timeouts=dict.fromkeys(STAGE_TIMEOUTS, args.stage_timeout) if args.stage_timeout else None
+    )
+    
+    if not args.profile:
+        export_data(args.output, **options)
+        return
+    
+    # Main thread only: git/gh run on collector threads the profiler doesn't see
+    profiler = cProfile.Profile()
+    profiler.runcall(export_data, args.output, **options)
+    profile_file = args.output / PROFILE_FILE
+    profiler.dump_stats(profile_file)
+    print(f"[✓] Profile saved to: {profile_file} (inspect with: python -m pstats {profile_file})")
 
 
 if __name__ == "__main__":
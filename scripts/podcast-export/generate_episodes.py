@@ -12,6 +12,7 @@ import argparse
 import json
 import os
 import re
+import time
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Optional, List, Dict
@@ -31,6 +32,9 @@ except ImportError:
     HAS_JINJA2 = False
     print("Warning: jinja2 not installed. Using simple string templates.")
 
+from ranking import EpisodeRanker, build_index
+from store import STORE_FILE, ExportStore
+
 PI_FLEET_ROOT = Path(__file__).parent.parent.parent
 TEMPLATES_DIR = Path(__file__).parent / "templates"
 
@@ -60,10 +64,111 @@ def load_config(config_path: Path) -> dict:
         raise
 
 
+def is_sharded_export(data_dir: Path) -> bool:
+    """True for an `export.py --format jsonl` output directory."""
+    return (data_dir / "manifest.json").exists() and not (data_dir / "raw-export.json").exists()
+
+
+def is_store_export(data_dir: Path) -> bool:
+    """True when the SQLite store is the only export format in ``data_dir``."""
+    return (data_dir / STORE_FILE).exists() and not any(
+        (data_dir / name).exists() for name in ("raw-export.json", "manifest.json")
+    )
+
+
+def open_store(data_dir: Path) -> ExportStore:
+    """Open the SQLite store written by `export.py --sqlite`, read-only."""
+    db_path = data_dir / STORE_FILE
+    if not db_path.exists():
+        raise FileNotFoundError(f"SQLite store not found at {db_path}")
+    return ExportStore(db_path, readonly=True)
+
+
+def print_search(store: ExportStore, query: str, limit: int = 20) -> None:
+    """Print the best keyword matches across all exported records."""
+    hits = store.search(query, limit=limit)
+    print(f"{len(hits)} matches for {query!r}:")
+    for hit in hits:
+        print(f"  [{hit['kind']}] {hit['parent']}")
+        print(f"      {hit['title'][:100]}")
+        print(f"      {hit['snippet']}")
+
+
+def load_sharded_export(data_dir: Path) -> dict:
+    """Rebuild the raw-export.json structure from a `--format jsonl` export."""
+    with open(data_dir / "manifest.json") as f:
+        manifest = json.load(f)
+    
+    export = {"metadata": manifest.get("metadata", {})}
+    records = {}
+    for name, shard in manifest["shards"].items():
+        export[name] = []
+        with open(data_dir / shard["path"]) as f:
+            for line in f:
+                record = json.loads(line)
+                records[record["id"]] = record
+                export[name].append(record)
+    
+    with open(data_dir / manifest["categories"]) as f:
+        categories = json.load(f)
+    export["categorized_by_episode"] = {
+        episode: [records[rid] for rid in ids]
+        for episode, ids in categories.items()
+    }
+    return export
+
+
+class ShardedExportReader:
+    """On-demand access to a `--format jsonl` export through offsets.json.
+    
+    Only the manifest, categories and offset index are read up front; each
+    record is fetched with one seek into its shard, so generating a single
+    episode parses just that episode's items.
+    """
+    
+    def __init__(self, data_dir: Path):
+        self.data_dir = data_dir
+        with open(data_dir / "manifest.json") as f:
+            self.manifest = json.load(f)
+        with open(data_dir / self.manifest["categories"]) as f:
+            self.categories = json.load(f)
+        with open(data_dir / self.manifest["offsets"]) as f:
+            self.offsets = json.load(f)
+        self.metadata = self.manifest.get("metadata", {})
+    
+    def shard_path(self, name: str) -> Path:
+        return self.data_dir / self.manifest["shards"][name]["path"]
+    
+    def records(self, ids: list[str]) -> list[dict]:
+        """Fetch records by ID, reading each shard in offset order."""
+        by_shard: Dict[str, list] = {}
+        for rid in ids:
+            shard, offset, length = self.offsets[rid]
+            by_shard.setdefault(shard, []).append((offset, length, rid))
+        
+        found = {}
+        for shard, entries in by_shard.items():
+            with open(self.shard_path(shard), "rb") as f:
+                for offset, length, rid in sorted(entries):
+                    f.seek(offset)
+                    found[rid] = json.loads(f.read(length))
+        return [found[rid] for rid in ids]
+    
+    def episode_items(self, episode_id: str) -> list[dict]:
+        return self.records(self.categories.get(episode_id, []))
+    
+    def shard(self, name: str) -> list[dict]:
+        """Read a whole shard (e.g. git_history, which is small)."""
+        with open(self.shard_path(name)) as f:
+            return [json.loads(line) for line in f]
+
+
 def load_export_data(data_dir: Path) -> dict:
     """Load exported data."""
     main_export = data_dir / "raw-export.json"
     if not main_export.exists():
+        if is_sharded_export(data_dir):
+            return load_sharded_export(data_dir)
         raise FileNotFoundError(f"Export data not found at {main_export}")
     
     with open(main_export) as f:
@@ -119,7 +224,8 @@ def generate_narrative_content(
     episode_config: dict,
     docs: list,
     conversations: list,
-    git_commits: list
+    git_commits: list,
+    ranker: Optional[EpisodeRanker] = None
 ) -> dict:
     """Generate narrative content structure for an episode."""
     
@@ -132,7 +238,7 @@ def generate_narrative_content(
     introduction = description.strip()
     
     # Generate acts based on available content
-    acts = generate_acts(episode_id, docs, conversations)
+    acts = generate_acts(episode_id, docs, conversations, ranker)
     
     # Generate lessons learned
     lessons = generate_lessons(episode_id, docs)
@@ -146,8 +252,17 @@ def generate_narrative_content(
     }
 
 
-def generate_acts(episode_id: str, docs: list, conversations: list) -> list[dict]:
-    """Generate act structure based on episode content."""
+def generate_acts(
+    episode_id: str,
+    docs: list,
+    conversations: list,
+    ranker: Optional[EpisodeRanker] = None
+) -> list[dict]:
+    """Generate act structure based on episode content.
+    
+    With a ranker, each act draws the docs, conversations and commits that
+    rank highest for its title and theme instead of the i-th item.
+    """
     
     # Default act structures based on episode type
     act_templates = {
@@ -211,12 +326,24 @@ def generate_acts(episode_id: str, docs: list, conversations: list) -> list[dict
     
     # Enrich acts with content from docs and conversations
     for i, act in enumerate(acts):
-        act["content"] = generate_act_content(act, docs, conversations, i)
+        if ranker:
+            picks = ranker.for_act(act)
+            act["content"] = generate_act_content(
+                act, picks["docs"], picks["conversations"], 0, picks["commits"]
+            )
+        else:
+            act["content"] = generate_act_content(act, docs, conversations, i)
     
     return acts
 
 
-def generate_act_content(act: dict, docs: list, conversations: list, act_index: int) -> str:
+def generate_act_content(
+    act: dict,
+    docs: list,
+    conversations: list,
+    act_index: int,
+    commits: Optional[list] = None
+) -> str:
     """Generate content for a single act."""
     
     content_parts = []
@@ -244,6 +371,12 @@ def generate_act_content(act: dict, docs: list, conversations: list, act_index:
             content_parts.append(f"At one point, I asked: \"{question[:200]}...\"")
             content_parts.append("")
     
+    # Add the most relevant commit (ranked acts only)
+    if commits:
+        commit = commits[0]
+        content_parts.append(f"The commit log remembers it as `{commit['hash']}`: \"{commit['subject']}\".")
+        content_parts.append("")
+    
     # Add placeholder for manual expansion
     content_parts.append("[Expand with specific details, commands, and personal commentary]")
     
@@ -545,9 +678,38 @@ def main():
         type=str,
         help="Generate only specific episode (e.g., '01-the-beginning')"
     )
+    parser.add_argument(
+        "--sqlite",
+        action="store_true",
+        help=f"Read episode data from {STORE_FILE} (export.py --sqlite) instead of JSON"
+    )
+    parser.add_argument(
+        "--search", "-s",
+        metavar="QUERY",
+        help=f"Keyword search over {STORE_FILE} and exit"
+    )
+    parser.add_argument(
+        "--rank",
+        action="store_true",
+        help="Pick docs, conversations and commits per episode and act by BM25 relevance "
+             "across the whole export instead of keyword category order"
+    )
+    parser.add_argument(
+        "--top-k",
+        type=int,
+        default=5,
+        help="Items per episode and per act with --rank (default: 5)"
+    )
     
     args = parser.parse_args()
     
+    if args.search:
+        try:
+            print_search(open_store(args.data), args.search)
+        except FileNotFoundError as e:
+            print(f"Error: {e}. Run export.py --sqlite first!")
+        return
+    
     print("=" * 60)
     print("Eldertree Podcast Episode Generator")
     print("=" * 60)
@@ -560,11 +722,28 @@ def main():
     
     # Load export data
     print("\n[2/4] Loading export data...")
+    reader = None
     try:
-        export_data = load_export_data(args.data)
-        categorized = export_data.get("categorized_by_episode", {})
-        all_conversations = export_data.get("chat_sessions", [])
-        print(f"      Loaded {len(all_conversations)} chat sessions")
+        if args.sqlite or is_store_export(args.data):
+            # Episode items are queried per episode below
+            reader = open_store(args.data)
+            export_data = {"git_history": reader.shard("git_history")}
+            categorized = {}
+            all_conversations = []
+            print(f"      Indexed {reader.count('chat_sessions')} chat sessions in {STORE_FILE} (loaded per episode)")
+        elif is_sharded_export(args.data):
+            # Episode items are fetched per episode below
+            reader = ShardedExportReader(args.data)
+            export_data = {"git_history": reader.shard("git_history")}
+            categorized = {}
+            all_conversations = []
+            stats = reader.metadata.get("stats", {})
+            print(f"      Indexed {stats.get('chat_sessions', 0)} chat sessions (loaded per episode)")
+        else:
+            export_data = load_export_data(args.data)
+            categorized = export_data.get("categorized_by_episode", {})
+            all_conversations = export_data.get("chat_sessions", [])
+            print(f"      Loaded {len(all_conversations)} chat sessions")
     except FileNotFoundError:
         print("      Warning: No export data found. Run export.py first!")
         print("      Generating with template content only...")
@@ -572,6 +751,23 @@ def main():
         categorized = {}
         all_conversations = []
     
+    # Build the ranking index once for all episodes
+    index = None
+    if args.rank:
+        start = time.perf_counter()
+        if reader:
+            corpus = {
+                name: reader.shard(name)
+                for name in ("documentation", "blog_posts", "chat_sessions")
+            }
+            corpus["git_history"] = export_data["git_history"]
+        else:
+            corpus = export_data
+        index = build_index(corpus)
+        del corpus
+        print(f"      Ranking index: {len(index)} items, {len(index.postings)} terms "
+              f"({time.perf_counter() - start:.2f}s)")
+    
     # Generate episodes
     print("\n[3/4] Generating episode scripts...")
     
@@ -585,13 +781,22 @@ def main():
         print(f"      Generating Episode {i}: {ep_config['title']}...")
         
         # Extract content for this episode
-        docs = extract_docs_for_episode(episode_id, categorized, ep_config)
-        conversations = extract_conversations_for_episode(episode_id, categorized, all_conversations)
+        ranker = None
+        if index:
+            ranker = EpisodeRanker(index, ep_config, args.top_k)
+            docs = ranker.top(["doc"])
+            conversations = ranker.top(["conversation"])
+        else:
+            if reader:
+                categorized = {episode_id: reader.episode_items(episode_id)}
+            docs = extract_docs_for_episode(episode_id, categorized, ep_config)
+            conversations = extract_conversations_for_episode(episode_id, categorized, all_conversations)
         
         # Generate narrative structure
         narrative = generate_narrative_content(
             ep_config, docs, conversations, 
-            export_data.get("git_history", [])
+            export_data.get("git_history", []),
+            ranker
         )
         
         # Get next episode for teaser
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Eldertree Podcast Export Metrics
+
+Per-stage instrumentation for export.py: wall and CPU time, files and bytes
+read, peak RSS and the slowest files of each stage. Written to
+EXPORT_SUMMARY.md and, machine-readable, to metrics.json.
+
+Usage:
+    python export.py --output ./podcast-data             # metrics.json in the output dir
+    python export.py --profile --output ./podcast-data   # plus export.prof (cProfile)
+"""
+
+import heapq
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Optional
+
+# resource is optional - Unix only, used for peak RSS
+try:
+    import resource
+    HAS_RESOURCE = True
+except ImportError:
+    HAS_RESOURCE = False
+
+METRICS_FILE = "metrics.json"
+PROFILE_FILE = "export.prof"
+SLOWEST_FILES = 5
+
+
+def peak_rss_mb() -> Optional[float]:
+    """High-water resident set size of this process so far, in MiB."""
+    if not HAS_RESOURCE:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / (1 << 10)
+
+
+class StageMetrics:
+    """Wall/CPU time, files, bytes and peak RSS of each export stage.
+    
+    ``stage(name)`` measures a block on the calling thread; ``file()`` calls
+    made on that thread while it runs are counted towards it, so stages on
+    the background collector threads are kept apart from the main thread's.
+    CPU time is the stage thread's own plus what pool workers report for
+    the files they parsed. Peak RSS is process-wide, so ``rss_growth_mb`` is
+    how far a stage pushed the high-water mark, not its own footprint.
+    """
+    
+    def __init__(self, slowest: int = SLOWEST_FILES):
+        self.slowest = slowest
+        self.stages: dict[str, dict[str, Any]] = {}
+        self.files: dict[str, list[tuple[float, str, int]]] = {}
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.start = time.perf_counter()
+    
+    def _entry(self, name: str) -> dict[str, Any]:
+        return self.stages.setdefault(name, {
+            "wall_seconds": 0.0, "cpu_seconds": 0.0, "items": 0, "files": 0, "bytes": 0
+        })
+    
+    @contextmanager
+    def stage(self, name: str):
+        """Measure a ``with`` block as stage ``name``; yields its entry for ``items``."""
+        with self.lock:
+            entry = self._entry(name)
+        rss_before = peak_rss_mb()
+        wall = time.perf_counter()
+        cpu = time.thread_time()
+        self.local.stage = name
+        try:
+            yield entry
+        finally:
+            self.local.stage = None
+            with self.lock:
+                entry["wall_seconds"] += time.perf_counter() - wall
+                entry["cpu_seconds"] += time.thread_time() - cpu
+                rss_after = peak_rss_mb()
+                if rss_after is not None:
+                    entry["peak_rss_mb"] = rss_after
+                    entry["rss_growth_mb"] = rss_after - rss_before
+    
+    def file(self, path: Any, seconds: float, size: int, cpu: float = 0.0) -> None:
+        """Count one file read by the current stage; ``cpu`` is worker CPU time, if any."""
+        name = getattr(self.local, "stage", None)
+        if name is None:
+            return
+        with self.lock:
+            entry = self._entry(name)
+            entry["files"] += 1
+            entry["bytes"] += size
+            entry["cpu_seconds"] += cpu
+            slowest = self.files.setdefault(name, [])
+            item = (seconds, str(path), size)
+            if len(slowest) < self.slowest:
+                heapq.heappush(slowest, item)
+            else:
+                heapq.heappushpop(slowest, item)
+    
+    def wall_seconds(self) -> float:
+        """Seconds since these metrics were created."""
+        return time.perf_counter() - self.start
+    
+    def slowest_files(self, name: Optional[str] = None) -> list[dict[str, Any]]:
+        """Slowest files of stage ``name`` (all stages if None), slowest first."""
+        names = [name] if name else list(self.files)
+        items = [(item, stage) for stage in names for item in self.files.get(stage, [])]
+        items.sort(key=lambda pair: pair[0][0], reverse=True)
+        return [
+            {"stage": stage, "path": path, "seconds": round(seconds, 4), "bytes": size}
+            for (seconds, path, size), stage in items[:self.slowest]
+        ]
+    
+    def report(self) -> dict[str, Any]:
+        """JSON-ready metrics: totals, then one entry per stage in start order."""
+        stages = {}
+        for name, entry in self.stages.items():
+            stages[name] = {
+                key: round(value, 3) if isinstance(value, float) else value
+                for key, value in entry.items()
+            }
+            stages[name]["slowest_files"] = self.slowest_files(name)
+        return {
+            "wall_seconds": round(self.wall_seconds(), 3),
+            "peak_rss_mb": round(peak_rss_mb(), 1) if HAS_RESOURCE else None,
+            "stages": stages
+        }
+    
+    def markdown(self) -> str:
+        """Summary section: a per-stage table and the slowest files overall."""
+        lines = [
+            f"Total wall time: {self.wall_seconds():.2f}s"
+            + (f", peak RSS {peak_rss_mb():.1f} MiB" if HAS_RESOURCE else ""),
+            "",
+            "| Stage | Wall s | CPU s | Items | Files | MiB read | Peak RSS MiB |",
+            "|---|---:|---:|---:|---:|---:|---:|"
+        ]
+        for name, entry in self.stages.items():
+            rss = entry.get("peak_rss_mb")
+            lines.append(
+                f"| {name} | {entry['wall_seconds']:.2f} | {entry['cpu_seconds']:.2f} "
+                f"| {entry['items']} | {entry['files']} | {entry['bytes'] / (1 << 20):.1f} "
+                f"| {'-' if rss is None else f'{rss:.1f}'} |"
+            )
+        slowest = self.slowest_files()
+        if slowest:
+            lines += ["", "Slowest files:", ""]
+            lines += [
+                f"- {item['seconds'] * 1000:.1f} ms `{item['path']}` ({item['stage']}, {item['bytes']} bytes)"
+                for item in slowest
+            ]
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Eldertree Podcast Content Ranking
+
+BM25 ranking over exported journey data. One inverted index is built over
+docs, blog posts, conversations and commits; each episode (and each act of
+it) is then ranked against that index with a query made from its keywords,
+title and description.
+
+Usage:
+    python generate_episodes.py --rank --data ./podcast/raw-data --output ./podcast
+"""
+
+import heapq
+import math
+import re
+from collections import Counter
+from typing import Any, Iterable, Optional
+
+# BM25 term-frequency saturation and length normalization
+K1 = 1.5
+B = 0.75
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset("""
+    a about after again all also an and any are as at be been before both but
+    by can could did do does down each few for from had has have how i if in
+    into is it its just more most no not of on one only or other our out over
+    own same so some such than that the their then there these they this to
+    too up us very was we were what when where which while why will with
+    would you your
+""".split())
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase alphanumeric terms of ``text``, without stopwords."""
+    return [t for t in TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+
+
+class BM25Index:
+    """Inverted index of ranked items: term -> [(item number, term frequency)].
+    
+    Scoring is term-at-a-time over the postings of the query terms only, so
+    a query costs as much as its terms' posting lists rather than the size
+    of the corpus. Each term's per-item BM25 weights are computed on first
+    use and kept until more items are added.
+    """
+    
+    def __init__(self, k1: float = K1, b: float = B):
+        self.k1 = k1
+        self.b = b
+        self.items: list[dict[str, Any]] = []
+        self.kinds: list[str] = []
+        self.lengths: list[int] = []
+        self.postings: dict[str, list[tuple[int, int]]] = {}
+        self.impacts: dict[str, list[tuple[int, float]]] = {}
+    
+    def __len__(self) -> int:
+        return len(self.items)
+    
+    def add(self, kind: str, item: dict[str, Any], text: str) -> None:
+        """Index ``item`` under ``kind`` ("doc", "blog", "conversation", "commit")."""
+        n = len(self.items)
+        terms = Counter(tokenize(text))
+        for term, tf in terms.items():
+            self.postings.setdefault(term, []).append((n, tf))
+        self.items.append(item)
+        self.kinds.append(kind)
+        self.lengths.append(sum(terms.values()))
+        self.impacts = {}
+    
+    def idf(self, term: str) -> float:
+        df = len(self.postings.get(term, ()))
+        return math.log(1 + (len(self.items) - df + 0.5) / (df + 0.5))
+    
+    def term_impacts(self, term: str) -> list[tuple[int, float]]:
+        """(item number, BM25 weight of ``term`` in that item) for every posting."""
+        impacts = self.impacts.get(term)
+        if impacts is None:
+            avgdl = sum(self.lengths) / len(self.lengths) or 1
+            idf = self.idf(term)
+            k1, b = self.k1, self.b
+            impacts = self.impacts[term] = [
+                (n, idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * self.lengths[n] / avgdl)))
+                for n, tf in self.postings.get(term, ())
+            ]
+        return impacts
+    
+    def scores(self, query: str) -> dict[int, float]:
+        """BM25 score of every item sharing at least one term with ``query``."""
+        scores: dict[int, float] = {}
+        if not self.items:
+            return scores
+        for term, qtf in Counter(tokenize(query)).items():
+            for n, impact in self.term_impacts(term):
+                scores[n] = scores.get(n, 0.0) + qtf * impact
+        return scores
+    
+    def search(
+        self,
+        query: str,
+        k: int = 10,
+        kinds: Optional[Iterable[str]] = None,
+        exclude: Iterable[int] = (),
+        scores: Optional[dict[int, float]] = None
+    ) -> list[tuple[float, int]]:
+        """Top ``k`` (score, item number) pairs, best first; ties keep index order.
+        
+        Pass ``scores`` from an earlier ``scores(query)`` call to select
+        several kinds without rescoring.
+        """
+        if scores is None:
+            scores = self.scores(query)
+        kinds = set(kinds) if kinds else None
+        exclude = set(exclude)
+        candidates = (
+            (score, n) for n, score in scores.items()
+            if n not in exclude and (kinds is None or self.kinds[n] in kinds)
+        )
+        return heapq.nlargest(k, candidates, key=lambda sn: (sn[0], -sn[1]))
+
+
+def build_index(export_data: dict[str, Any]) -> BM25Index:
+    """Index the docs, blog posts, conversations and commits of an export.
+    
+    Items are stored in the shapes generate_episodes.py already uses: docs
+    and blog posts as title/filename/content_preview, conversations as
+    question/answer pairs, commits as hash/date/subject.
+    """
+    index = BM25Index()
+    
+    for kind, records in (("doc", "documentation"), ("blog", "blog_posts")):
+        for record in export_data.get(records, []):
+            content = record.get("content", "")
+            index.add(kind, {
+                "title": record.get("title", ""),
+                "filename": record.get("filename", ""),
+                "content_preview": content[:1000]
+            }, record.get("title", "") + " " + content)
+    
+    for session in export_data.get("chat_sessions", []):
+        for conv in session.get("conversations", []):
+            if conv.get("user") and conv.get("assistant"):
+                index.add("conversation", {
+                    "question": conv["user"][:500],
+                    "answer": conv["assistant"][:2000]
+                }, conv["user"] + " " + conv["assistant"])
+    
+    for commit in export_data.get("git_history", []):
+        index.add("commit", {
+            "hash": commit.get("hash", ""),
+            "date": commit.get("date", ""),
+            "subject": commit.get("subject", "")
+        }, commit.get("subject", "") + " " + commit.get("body", ""))
+    
+    return index
+
+
+def episode_query(episode_config: dict) -> str:
+    """Query text for an episode: keywords, title, subtitle and description."""
+    return " ".join([
+        *(episode_config.get("keywords") or []),
+        episode_config.get("title", ""),
+        episode_config.get("subtitle", ""),
+        episode_config.get("description", "")
+    ])
+
+
+class EpisodeRanker:
+    """Ranks the index for one episode and hands out distinct items per act."""
+    
+    def __init__(self, index: BM25Index, episode_config: dict, k: int = 5):
+        self.index = index
+        self.query = episode_query(episode_config)
+        self.k = k
+        self.used: set[int] = set()
+        self.scores = index.scores(self.query)
+    
+    def top(self, kinds: Iterable[str], k: Optional[int] = None) -> list[dict[str, Any]]:
+        """Most relevant items of ``kinds`` for the whole episode."""
+        hits = self.index.search(self.query, k or self.k, kinds, scores=self.scores)
+        return [self.index.items[n] for _, n in hits]
+    
+    def for_act(self, act: dict) -> dict[str, list[dict[str, Any]]]:
+        """Top docs, conversations and commits for an act.
+        
+        The act's title and theme are weighted over the episode query, and
+        items picked for earlier acts are skipped so acts don't repeat.
+        """
+        act_text = f"{act.get('title', '')} {act.get('theme', '')}"
+        query = f"{act_text} {act_text} {self.query}"
+        scores = self.index.scores(query)
+        picks = {}
+        for name, kinds in (
+            ("docs", ("doc", "blog")),
+            ("conversations", ("conversation",)),
+            ("commits", ("commit",))
+        ):
+            hits = self.index.search(query, self.k, kinds, self.used, scores)
+            self.used.update(n for _, n in hits)
+            picks[name] = [self.index.items[n] for _, n in hits]
+        return picks
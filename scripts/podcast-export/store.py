@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""
+Eldertree Podcast Export Store
+
+SQLite store for exported journey data: sessions, conversations, docs, blog
+posts, commits and issues in indexed tables, plus an FTS5 index for keyword
+search. Written by ``export.py --sqlite`` and read by ``generate_episodes.py``.
+
+Usage:
+    python export.py --sqlite --output ./podcast-data
+    python generate_episodes.py --search "longhorn replica" --data ./podcast-data
+"""
+
+import hashlib
+import json
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterator, Optional
+from urllib.parse import quote
+
+STORE_FILE = "export.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    session_id TEXT,
+    workspace TEXT,
+    created_date,  -- no affinity: Cursor stores epoch millis, keep them as-is
+    last_message_date,
+    episode TEXT,
+    digest TEXT,
+    run TEXT,
+    position INTEGER,  -- order within the shard in the last run that wrote it
+    absent_keys TEXT  -- JSON list of mapped keys the record didn't have
+);
+CREATE TABLE IF NOT EXISTS conversations (
+    session TEXT NOT NULL REFERENCES sessions(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    request_id TEXT,
+    user TEXT,
+    assistant TEXT,
+    PRIMARY KEY (session, position)
+);
+CREATE TABLE IF NOT EXISTS docs (
+    id TEXT PRIMARY KEY,
+    path TEXT,
+    filename TEXT,
+    title TEXT,
+    content TEXT,
+    size INTEGER,
+    episode TEXT,
+    digest TEXT,
+    run TEXT,
+    position INTEGER,  -- order within the shard in the last run that wrote it
+    absent_keys TEXT  -- JSON list of mapped keys the record didn't have
+);
+CREATE TABLE IF NOT EXISTS blog_posts (
+    id TEXT PRIMARY KEY,
+    path TEXT,
+    filename TEXT,
+    title TEXT,
+    date TEXT,
+    content TEXT,
+    digest TEXT,
+    run TEXT,
+    position INTEGER,  -- order within the shard in the last run that wrote it
+    absent_keys TEXT  -- JSON list of mapped keys the record didn't have
+);
+CREATE TABLE IF NOT EXISTS commits (
+    id TEXT PRIMARY KEY,
+    hash TEXT,
+    full_hash TEXT,
+    date TEXT,
+    subject TEXT,
+    body TEXT,
+    digest TEXT,
+    run TEXT,
+    position INTEGER,  -- order within the shard in the last run that wrote it
+    absent_keys TEXT  -- JSON list of mapped keys the record didn't have
+);
+CREATE TABLE IF NOT EXISTS issues (
+    id TEXT PRIMARY KEY,
+    type TEXT,
+    number INTEGER,
+    title TEXT,
+    body TEXT,
+    state TEXT,
+    created_at TEXT,
+    updated_at TEXT,
+    closed_at TEXT,
+    merged_at TEXT,
+    labels TEXT,
+    digest TEXT,
+    run TEXT,
+    position INTEGER,  -- order within the shard in the last run that wrote it
+    absent_keys TEXT  -- JSON list of mapped keys the record didn't have
+);
+CREATE INDEX IF NOT EXISTS sessions_episode ON sessions(episode);
+CREATE INDEX IF NOT EXISTS docs_episode ON docs(episode);
+CREATE INDEX IF NOT EXISTS docs_filename ON docs(filename);
+CREATE INDEX IF NOT EXISTS blog_posts_date ON blog_posts(date);
+CREATE INDEX IF NOT EXISTS commits_date ON commits(date);
+CREATE INDEX IF NOT EXISTS issues_type_number ON issues(type, number);
+
+-- FTS rows are keyed by search_items.rowid so they can be replaced cheaply
+CREATE TABLE IF NOT EXISTS search_items (
+    rowid INTEGER PRIMARY KEY,
+    id TEXT UNIQUE NOT NULL,
+    kind TEXT NOT NULL,
+    parent TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS search_items_parent ON search_items(parent);
+CREATE VIRTUAL TABLE IF NOT EXISTS search USING fts5(title, body, tokenize='porter unicode61');
+"""
+
+# Export shard -> (table, [(column, record key)], search kind)
+TABLES = {
+    "chat_sessions": ("sessions", [
+        ("session_id", "session_id"), ("workspace", "workspace"),
+        ("created_date", "created_date"), ("last_message_date", "last_message_date")
+    ], "conversation"),
+    "documentation": ("docs", [
+        ("path", "path"), ("filename", "filename"), ("title", "title"),
+        ("content", "content"), ("size", "size")
+    ], "doc"),
+    "blog_posts": ("blog_posts", [
+        ("path", "path"), ("filename", "filename"), ("title", "title"),
+        ("date", "date"), ("content", "content")
+    ], "blog"),
+    "git_history": ("commits", [
+        ("hash", "hash"), ("full_hash", "full_hash"), ("date", "date"),
+        ("subject", "subject"), ("body", "body")
+    ], "commit"),
+    "github_issues": ("issues", [
+        ("type", "type"), ("number", "number"), ("title", "title"), ("body", "body"),
+        ("state", "state"), ("created_at", "createdAt"), ("updated_at", "updatedAt"),
+        ("closed_at", "closedAt"), ("merged_at", "mergedAt"), ("labels", "labels")
+    ], "issue"),
+}
+CATEGORIZED = {"chat_sessions": "conversation", "documentation": "documentation"}
+
+# Columns added after a store may have been created: (table or None for
+# every record table, column, type)
+ADDED_COLUMNS = [
+    (None, "position", "INTEGER"),
+    (None, "absent_keys", "TEXT"),
+    ("issues", "updated_at", "TEXT"),
+]
+
+
+class ExportStore:
+    """SQLite store of one export directory's records.
+    
+    ``upsert`` compares a digest of each record with the stored one, so a
+    re-export only rewrites rows (and their FTS entries) that changed;
+    ``close(prune=True)`` drops rows the current run did not write.
+    """
+    
+    def __init__(self, path: Path, readonly: bool = False):
+        self.path = path
+        if readonly:
+            self.db = sqlite3.connect(f"file:{quote(str(path))}?mode=ro", uri=True)
+        else:
+            self.db = sqlite3.connect(path)
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self.db.execute("PRAGMA foreign_keys=ON")
+            self.db.executescript(SCHEMA)
+            self._migrate()
+        self.db.row_factory = sqlite3.Row
+        self.run = datetime.now().isoformat()
+        self.positions = {shard: 0 for shard in TABLES}
+        self.written = 0
+        self.unchanged = 0
+    
+    def _migrate(self) -> None:
+        """Add columns introduced after a store was first created.
+        
+        A table that gains a column has its digests cleared, so the next
+        upsert rewrites every row with the new column filled in.
+        """
+        for table, _, _ in TABLES.values():
+            columns = {row[1] for row in self.db.execute(f"PRAGMA table_info({table})")}
+            added = False
+            for only, column, kind in ADDED_COLUMNS:
+                if only in (None, table) and column not in columns:
+                    self.db.execute(f"ALTER TABLE {table} ADD COLUMN {column} {kind}")
+                    added = True
+            if added:
+                self.db.execute(f"UPDATE {table} SET digest = NULL")
+    
+    def upsert(self, shard: str, rid: str, record: dict, category: Optional[str] = None) -> None:
+        """Insert or update one export record under its export ID.
+        
+        Records are numbered per shard in upsert order, so ``records`` reads
+        them back in the order of the current export.
+        """
+        table, columns, kind = TABLES[shard]
+        position = self.positions[shard]
+        self.positions[shard] += 1
+        digest = hashlib.sha1(
+            json.dumps([record, category], sort_keys=True, default=str).encode()
+        ).hexdigest()
+        
+        row = self.db.execute(f"SELECT digest FROM {table} WHERE id = ?", (rid,)).fetchone()
+        if row and row["digest"] == digest:
+            self.db.execute(
+                f"UPDATE {table} SET run = ?, position = ? WHERE id = ?", (self.run, position, rid)
+            )
+            self.unchanged += 1
+            return
+        
+        absent = [key for _, key in columns if key not in record]
+        names = ["id"] + [column for column, _ in columns] + ["digest", "run", "position", "absent_keys"]
+        values = [rid] + [self._value(record.get(key)) for _, key in columns] + [
+            digest, self.run, position, json.dumps(absent) if absent else None
+        ]
+        if shard in CATEGORIZED:
+            names.append("episode")
+            values.append(category)
+        updates = ", ".join(f"{name} = excluded.{name}" for name in names[1:])
+        self.db.execute(
+            f"INSERT INTO {table} ({', '.join(names)}) VALUES ({', '.join('?' * len(names))}) "
+            f"ON CONFLICT(id) DO UPDATE SET {updates}",
+            values
+        )
+        
+        self._unindex(rid)
+        if shard == "chat_sessions":
+            self.db.execute("DELETE FROM conversations WHERE session = ?", (rid,))
+            for position, conv in enumerate(record.get("conversations", [])):
+                self.db.execute(
+                    "INSERT INTO conversations (session, position, request_id, user, assistant) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (rid, position, conv.get("request_id", ""), conv.get("user", ""), conv.get("assistant", ""))
+                )
+                self._index(f"{rid}#{position}", kind, rid, conv.get("user", ""), conv.get("assistant", ""))
+        elif shard == "git_history":
+            self._index(rid, kind, rid, record.get("subject", ""), record.get("body", ""))
+        else:
+            self._index(rid, kind, rid, record.get("title", ""), record.get("content", record.get("body", "")))
+        self.written += 1
+    
+    @staticmethod
+    def _value(value: Any) -> Any:
+        if isinstance(value, (list, dict)):
+            return json.dumps(value, default=str)
+        return value
+    
+    def _index(self, item_id: str, kind: str, parent: str, title: str, body: str) -> None:
+        cursor = self.db.execute(
+            "INSERT INTO search_items (id, kind, parent) VALUES (?, ?, ?)",
+            (item_id, kind, parent)
+        )
+        self.db.execute(
+            "INSERT INTO search (rowid, title, body) VALUES (?, ?, ?)",
+            (cursor.lastrowid, title or "", body or "")
+        )
+    
+    def _unindex(self, parent: str) -> None:
+        rowids = [r[0] for r in self.db.execute("SELECT rowid FROM search_items WHERE parent = ?", (parent,))]
+        for rowid in rowids:
+            self.db.execute("DELETE FROM search WHERE rowid = ?", (rowid,))
+        self.db.execute("DELETE FROM search_items WHERE parent = ?", (parent,))
+    
+    def close(self, prune: bool = True) -> int:
+        """Commit; with ``prune``, delete records this run didn't write. Returns rows pruned."""
+        pruned = 0
+        if prune:
+            for table, _, _ in TABLES.values():
+                stale = [r[0] for r in self.db.execute(f"SELECT id FROM {table} WHERE run != ?", (self.run,))]
+                for rid in stale:
+                    self._unindex(rid)
+                self.db.execute(f"DELETE FROM {table} WHERE run != ?", (self.run,))
+                pruned += len(stale)
+        self.db.commit()
+        self.db.close()
+        return pruned
+    
+    # --- Queries -----------------------------------------------------------
+    
+    def search(self, query: str, kinds: Optional[list[str]] = None, limit: int = 20) -> list[dict[str, Any]]:
+        """Best FTS5 (bm25) matches for ``query``, e.g. ``"longhorn replica"``.
+        
+        Each hit has the item ``id``, its ``kind`` ("conversation", "doc",
+        "blog", "commit" or "issue"), the record ``parent`` ID, ``title`` and
+        a highlighted ``snippet`` of the body.
+        """
+        sql = (
+            "SELECT i.id, i.kind, i.parent, search.title, "
+            "snippet(search, 1, '[', ']', '…', 16) AS snippet, bm25(search) AS score "
+            "FROM search JOIN search_items i ON i.rowid = search.rowid "
+            "WHERE search MATCH ?"
+        )
+        params: list[Any] = [fts_query(query)]
+        if kinds:
+            sql += f" AND i.kind IN ({', '.join('?' * len(kinds))})"
+            params.extend(kinds)
+        sql += " ORDER BY score LIMIT ?"
+        params.append(limit)
+        return [dict(row) for row in self.db.execute(sql, params)]
+    
+    def records(self, shard: str, where: str = "", params: tuple = ()) -> Iterator[dict[str, Any]]:
+        """Records of ``shard`` in the same shape and order as raw-export.json."""
+        table, columns, _ = TABLES[shard]
+        rows = self.db.execute(f"SELECT * FROM {table} {where} ORDER BY position, rowid", params)
+        for row in rows:
+            record = {}
+            absent = json.loads(row["absent_keys"]) if row["absent_keys"] else ()
+            for column, key in columns:
+                if key in absent:
+                    continue
+                value = row[column]
+                if column == "labels" and value is not None:
+                    value = json.loads(value)
+                record[key] = value
+            if shard == "chat_sessions":
+                record["conversations"] = [
+                    {"user": c["user"], "assistant": c["assistant"], "request_id": c["request_id"]}
+                    for c in self.db.execute(
+                        "SELECT * FROM conversations WHERE session = ? ORDER BY position", (row["id"],)
+                    )
+                ]
+            if shard in CATEGORIZED:
+                record["source_type"] = CATEGORIZED[shard]
+            yield record
+    
+    def shard(self, name: str) -> list[dict[str, Any]]:
+        """All records of a shard (same call as ShardedExportReader.shard)."""
+        return list(self.records(name))
+    
+    def episode_items(self, episode: str) -> list[dict[str, Any]]:
+        """Docs then chat sessions categorized under ``episode``."""
+        where = "WHERE episode = ?"
+        return [
+            *self.records("documentation", where, (episode,)),
+            *self.records("chat_sessions", where, (episode,))
+        ]
+    
+    def count(self, shard: str) -> int:
+        table = TABLES[shard][0]
+        return self.db.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def fts_query(text: str) -> str:
+    """Quote each word so user text can't be parsed as FTS5 syntax; words are ANDed."""
+    return " ".join('"' + word.replace('"', '""') + '"' for word in text.split())
+
+
+def has_fts5() -> bool:
+    db = sqlite3.connect(":memory:")
+    try:
+        db.execute("CREATE VIRTUAL TABLE t USING fts5(x)")
+        return True
+    except sqlite3.OperationalError:
+        return False
+    finally:
+        db.close()
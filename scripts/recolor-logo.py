@@ -3,12 +3,41 @@
 
 from __future__ import annotations
 
+import argparse
 import colorsys
+import hashlib
+import json
+import os
 import sys
-from collections import deque
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
-from PIL import Image
+from PIL import Image, features
+
+# numpy is optional - enables the whole-array engine
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+ENGINES = ("pixel", "numpy", "lut")
+DEFAULT_ENGINE = "numpy" if HAS_NUMPY else "pixel"
+
+# Favicon / touch-icon / PWA sizes written in batch mode
+DEFAULT_ICON_SIZES = (16, 32, 48, 180, 192, 512)
+
+# Save options per icon format; ico bundles every icon size up to 256 px
+ICON_FORMATS = {
+    "png": {"optimize": True},
+    "webp": {"quality": 90, "method": 6},
+    "avif": {"quality": 80},
+    "ico": {},
+}
+
+ROOT = Path(__file__).resolve().parents[1]
+CACHE_FILE = ROOT / ".cache" / "recolor-logo.json"
 
 # Tuned for dark blog background (var.css dark mode)
 BRAND_DARK = (13, 148, 136)  # #0d9488
@@ -78,38 +107,80 @@ def recolor_pixel(r: int, g: int, b: int, a: int) -> tuple[int, int, int, int]:
     return nr, ng, nb, a
 
 
+class EdgeRunLabeler:
+    """Find background runs 4-connected to the image border.
+
+    Rows are fed top to bottom as sorted ``(start, end)`` runs of background
+    pixels. Each run is unioned with every run it overlaps in the previous
+    row, so memory is proportional to the number of runs, not pixels.
+    """
+
+    def __init__(self, width: int, height: int) -> None:
+        self.width = width
+        self.height = height
+        self.parent: list[int] = []
+        self.edge: list[bool] = []
+        self.rows: list[list[tuple[int, int, int]]] = []
+
+    def _find(self, i: int) -> int:
+        parent = self.parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def _union(self, a: int, b: int) -> None:
+        ra, rb = self._find(a), self._find(b)
+        if ra != rb:
+            self.parent[rb] = ra
+            self.edge[ra] = self.edge[ra] or self.edge[rb]
+
+    def add_row(self, runs: list[tuple[int, int]]) -> None:
+        y = len(self.rows)
+        border_row = y == 0 or y == self.height - 1
+        prev = self.rows[-1] if self.rows else []
+        row = []
+        j = 0
+        for start, end in runs:
+            rid = len(self.parent)
+            self.parent.append(rid)
+            self.edge.append(border_row or start == 0 or end == self.width)
+            # Skip previous-row runs that end before this one starts
+            while j < len(prev) and prev[j][1] <= start:
+                j += 1
+            k = j
+            while k < len(prev) and prev[k][0] < end:
+                self._union(prev[k][2], rid)
+                k += 1
+            row.append((start, end, rid))
+        self.rows.append(row)
+
+    def edge_runs(self, y: int) -> list[tuple[int, int]]:
+        return [(start, end) for start, end, rid in self.rows[y] if self.edge[self._find(rid)]]
+
+
 def flood_clear_background(im: Image.Image) -> None:
     """Remove background connected to image edges (white square)."""
     w, h = im.size
     px = im.load()
-    seen = bytearray(w * h)
-    q: deque[tuple[int, int]] = deque()
-
-    def push(x: int, y: int) -> None:
-        if 0 <= x < w and 0 <= y < h:
-            q.append((x, y))
-
-    for x in range(w):
-        push(x, 0)
-        push(x, h - 1)
+    labeler = EdgeRunLabeler(w, h)
     for y in range(h):
-        push(0, y)
-        push(w - 1, y)
+        runs = []
+        start = None
+        for x in range(w):
+            if is_background_pixel(*px[x, y]):
+                if start is None:
+                    start = x
+            elif start is not None:
+                runs.append((start, x))
+                start = None
+        if start is not None:
+            runs.append((start, w))
+        labeler.add_row(runs)
 
-    while q:
-        x, y = q.popleft()
-        idx = y * w + x
-        if seen[idx]:
-            continue
-        seen[idx] = 1
-        r, g, b, a = px[x, y]
-        if not is_background_pixel(r, g, b, a):
-            continue
-        px[x, y] = (0, 0, 0, 0)
-        push(x - 1, y)
-        push(x + 1, y)
-        push(x, y - 1)
-        push(x, y + 1)
+    for y in range(h):
+        for start, end in labeler.edge_runs(y):
+            im.paste((0, 0, 0, 0), (start, y, end, y + 1))
 
 
 def clean_light_fringe(im: Image.Image) -> None:
@@ -134,15 +205,298 @@ def clean_light_fringe(im: Image.Image) -> None:
                 px[x, y] = (tr, tg, tb, max(0, min(255, alpha)))
 
 
-def process_image(src: Path, dest: Path) -> Image.Image:
+# --- Whole-array engine -----------------------------------------------------
+# Mirrors the per-pixel functions above operation for operation (same float64
+# arithmetic, same truncation) so both engines write byte-identical PNGs.
+
+
+def rgb_to_hsv_array(rgb: "np.ndarray") -> tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+    """Vectorised colorsys.rgb_to_hsv over an (..., 3) uint8 array."""
+    c = rgb.astype(np.float64) / 255
+    r, g, b = c[..., 0], c[..., 1], c[..., 2]
+    maxc = c.max(axis=-1)
+    minc = c.min(axis=-1)
+    rangec = maxc - minc
+    gray = minc == maxc
+    safe_max = np.where(gray, 1.0, maxc)
+    safe_range = np.where(gray, 1.0, rangec)
+    s = np.where(gray, 0.0, rangec / safe_max)
+    rc = (maxc - r) / safe_range
+    gc = (maxc - g) / safe_range
+    bc = (maxc - b) / safe_range
+    h = np.where(r == maxc, bc - gc, np.where(g == maxc, 2.0 + rc - bc, 4.0 + gc - rc))
+    h = np.where(gray, 0.0, (h / 6.0) % 1.0)
+    return h, s, maxc
+
+
+def lerp_array(a: "np.ndarray", b: "np.ndarray", t: "np.ndarray") -> "np.ndarray":
+    """Vectorised lerp; ``a``/``b`` broadcast as (..., 3), ``t`` as (...)."""
+    t = np.clip(t, 0.0, 1.0)[..., None]
+    return np.trunc(a + (b - a) * t).astype(np.int64)
+
+
+def brand_rgb_array(value: "np.ndarray", saturation: "np.ndarray") -> "np.ndarray":
+    v = np.clip(value, 0.0, 1.0)
+    dark, mid, light, highlight = (
+        np.array(c, dtype=np.int64) for c in (BRAND_DARK, BRAND_MID, BRAND_LIGHT, BRAND_HIGHLIGHT)
+    )
+    low = (v < 0.30)[..., None]
+    middle = (v < 0.55)[..., None]
+    base = np.where(
+        low,
+        lerp_array(dark, mid, v / 0.30),
+        np.where(
+            middle,
+            lerp_array(mid, light, (v - 0.30) / 0.25),
+            lerp_array(light, highlight, (v - 0.55) / 0.45),
+        ),
+    )
+    muted = lerp_array(base, mid, np.full(v.shape, 0.4))
+    return np.where((saturation < 0.25)[..., None], muted, base)
+
+
+def is_green_family_array(h: "np.ndarray", s: "np.ndarray", v: "np.ndarray") -> "np.ndarray":
+    return ~((s < 0.05) | (v < 0.04)) & (h >= 0.10) & (h <= 0.62)
+
+
+def is_background_array(
+    rgb: "np.ndarray", a: "np.ndarray", s: "np.ndarray", v: "np.ndarray"
+) -> "np.ndarray":
+    return (
+        (a < 12)
+        | ((v >= 0.78) & (s <= 0.20))
+        | ((rgb.min(axis=-1) >= 200) & (s <= 0.14))
+    )
+
+
+def recolor_array(arr: "np.ndarray") -> None:
+    """Apply recolor_pixel to an (h, w, 4) uint8 RGBA array in place."""
+    rgb = arr[..., :3]
+    a = arr[..., 3]
+    h, s, v = rgb_to_hsv_array(rgb)
+    transparent = a < 8
+    background = is_background_array(rgb, a, s, v)
+    green = is_green_family_array(h, s, v)
+    fringe = ~green & (v > 0.72) & (s < 0.22)
+
+    tinted = ~transparent & ~background & green
+    cleared = ~transparent & (background | fringe)
+
+    blend = 0.9
+    target = brand_rgb_array(v[tinted], s[tinted])
+    source = rgb[tinted].astype(np.float64)
+    rgb[tinted] = np.trunc(source * (1 - blend) + target * blend).astype(np.uint8)
+    a[transparent] = 0
+    arr[cleared] = 0
+
+
+def background_runs_array(mask: "np.ndarray") -> list[list[tuple[int, int]]]:
+    """Split an (h, w) bool mask into per-row ``(start, end)`` runs."""
+    h, w = mask.shape
+    padded = np.zeros((h, w + 2), dtype=np.int8)
+    padded[:, 1:-1] = mask
+    step = np.diff(padded, axis=1)
+    rows, starts = np.nonzero(step == 1)
+    _, ends = np.nonzero(step == -1)
+    bounds = np.searchsorted(rows, np.arange(h + 1))
+    pairs = list(zip(starts.tolist(), ends.tolist()))
+    return [pairs[bounds[y]:bounds[y + 1]] for y in range(h)]
+
+
+def label_background_array(labeler: EdgeRunLabeler, arr: "np.ndarray") -> None:
+    """Feed the background runs of the next ``arr`` rows to ``labeler``."""
+    rgb = arr[..., :3]
+    _, s, v = rgb_to_hsv_array(rgb)
+    for runs in background_runs_array(is_background_array(rgb, arr[..., 3], s, v)):
+        labeler.add_row(runs)
+
+
+def clear_edge_runs_array(labeler: EdgeRunLabeler, arr: "np.ndarray", y0: int = 0) -> None:
+    """Clear the edge-connected runs of image rows ``y0`` onwards held in ``arr``."""
+    for dy in range(arr.shape[0]):
+        for start, end in labeler.edge_runs(y0 + dy):
+            arr[dy, start:end] = 0
+
+
+def flood_clear_background_array(arr: "np.ndarray") -> None:
+    """Apply flood_clear_background to an (h, w, 4) uint8 RGBA array in place."""
+    h, w = arr.shape[:2]
+    labeler = EdgeRunLabeler(w, h)
+    label_background_array(labeler, arr)
+    clear_edge_runs_array(labeler, arr)
+
+
+def clean_light_fringe_array(arr: "np.ndarray") -> None:
+    """Apply clean_light_fringe to an (h, w, 4) uint8 RGBA array in place."""
+    rgb = arr[..., :3]
+    a = arr[..., 3]
+    _, s, v = rgb_to_hsv_array(rgb)
+    fringe = (a >= 8) & (v > 0.68) & (s < 0.28)
+
+    px = arr[fringe].astype(np.int64)
+    r, g, b = px[:, 0], px[:, 1], px[:, 2]
+    greenness = np.clip((g - np.maximum(r, b)) / 80.0, 0.0, 1.0)
+    alpha = np.clip(np.trunc(px[:, 3] * greenness * 0.85), 0, 255)
+
+    tr, tg, tb = brand_rgb(0.55, 0.35)
+    out = np.empty_like(px)
+    out[:, 0], out[:, 1], out[:, 2] = tr, tg, tb
+    out[:, 3] = alpha
+    out[greenness < 0.08] = 0
+    arr[fringe] = out.astype(np.uint8)
+
+
+# --- Colour lookup table -----------------------------------------------------
+# recolor_pixel only looks at alpha through the < 8 / < 12 cut-offs, and the
+# fringe test only at RGB, so one 32-bit word per RGB colour captures both:
+#   bits 0-23   recolored RGB (alpha >= 12, not cleared)
+#   bits 24-30  fringe green excess g - max(r, b) clamped to 0..80, or 127
+#   bit 31      cleared by recolor_pixel (alpha >= 12)
+
+LUT_NOT_FRINGE = 0x7F
+LUT_CLEAR = 1 << 31
+
+
+def build_color_lut() -> "np.ndarray":
+    """Evaluate recolor_array and the fringe test once for all 2**24 colours."""
+    lut = np.empty(1 << 24, dtype=np.uint32)
+    codes = np.arange(1 << 16, dtype=np.uint32)
+    for r in range(256):
+        rgba = np.empty((1 << 16, 4), dtype=np.uint8)
+        rgba[:, 0] = r
+        rgba[:, 1] = codes >> 8
+        rgba[:, 2] = codes & 0xFF
+        rgba[:, 3] = 255
+        src = rgba[:, :3].astype(np.int64)
+        _, s, v = rgb_to_hsv_array(rgba[:, :3])
+
+        fringe = np.clip(src[:, 1] - np.maximum(src[:, 0], src[:, 2]), 0, 80)
+        fringe[~((v > 0.68) & (s < 0.28))] = LUT_NOT_FRINGE
+
+        recolor_array(rgba)
+        out = rgba.astype(np.uint32)
+        word = (out[:, 0] << 16) | (out[:, 1] << 8) | out[:, 2] | (fringe.astype(np.uint32) << 24)
+        word[rgba[:, 3] == 0] |= LUT_CLEAR
+        lut[r << 16:(r + 1) << 16] = word
+    return lut
+
+
+_color_lut = None
+
+
+def color_lut(persist: bool = True) -> "np.ndarray":
+    """Load the colour table, building it on first use.
+
+    Persisted tables live in .cache/ keyed by params_digest, so editing the
+    palette or thresholds builds a fresh one and deletes the tables it
+    replaces; they are memory-mapped, so batch workers share the page cache
+    instead of each holding 64 MB.
+    """
+    global _color_lut
+    if _color_lut is not None:
+        return _color_lut
+    path = CACHE_FILE.parent / f"recolor-lut-{params_digest('lut', ())[:16]}.npy"
+    if persist and path.exists():
+        _color_lut = np.load(path, mmap_mode="r")
+        return _color_lut
+
+    started = time.perf_counter()
+    lut = build_color_lut()
+    print(f"built colour table in {time.perf_counter() - started:.1f}s")
+    if persist:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npy")
+        np.save(tmp, lut)
+        os.replace(tmp, path)
+        # Only finished tables (no pid part), so other workers' tmp files survive
+        for stale in path.parent.glob(f"recolor-lut-{'?' * 16}.npy"):
+            if stale != path:
+                stale.unlink(missing_ok=True)
+    _color_lut = lut
+    return lut
+
+
+def lut_index(rgb: "np.ndarray") -> "np.ndarray":
+    c = rgb.astype(np.uint32)
+    return (c[..., 0] << 16) | (c[..., 1] << 8) | c[..., 2]
+
+
+def recolor_lut(arr: "np.ndarray", lut: "np.ndarray") -> None:
+    """recolor_array via the colour table; same result, one lookup per pixel."""
+    a = arr[..., 3]
+    word = lut[lut_index(arr[..., :3])]
+    transparent = a < 8
+    cleared = ~transparent & ((a < 12) | (word & LUT_CLEAR != 0))
+    kept = ~transparent & ~cleared
+    arr[..., 0] = np.where(kept, (word >> 16) & 0xFF, arr[..., 0])
+    arr[..., 1] = np.where(kept, (word >> 8) & 0xFF, arr[..., 1])
+    arr[..., 2] = np.where(kept, word & 0xFF, arr[..., 2])
+    a[transparent] = 0
+    arr[cleared] = 0
+
+
+def clean_light_fringe_lut(arr: "np.ndarray", lut: "np.ndarray") -> None:
+    """clean_light_fringe_array via the colour table's fringe bits."""
+    excess = (lut[lut_index(arr[..., :3])] >> 24) & LUT_NOT_FRINGE
+    fringe = (arr[..., 3] >= 8) & (excess != LUT_NOT_FRINGE)
+
+    greenness = excess[fringe] / 80.0
+    alpha = np.clip(np.trunc(arr[..., 3][fringe] * greenness * 0.85), 0, 255)
+    out = np.empty((len(greenness), 4), dtype=np.int64)
+    out[:, :3] = brand_rgb(0.55, 0.35)
+    out[:, 3] = alpha
+    out[greenness < 0.08] = 0
+    arr[fringe] = out.astype(np.uint8)
+
+
+def process_strips(im: Image.Image, engine: str, strip_rows: int) -> None:
+    """Run the numpy/lut pipeline over ``im`` in place, ``strip_rows`` rows at a time.
+
+    Array temporaries (HSV planes, masks) are bounded by the strip size. The
+    flood fill needs the whole image, so it takes two passes: the first
+    recolors each strip and feeds its background runs to one EdgeRunLabeler;
+    once every row is labelled, the second clears edge-connected runs and
+    cleans the fringe strip by strip.
+    """
+    w, h = im.size
+    lut = color_lut() if engine == "lut" else None
+    labeler = EdgeRunLabeler(w, h)
+    for y0 in range(0, h, strip_rows):
+        box = (0, y0, w, min(h, y0 + strip_rows))
+        arr = np.array(im.crop(box))
+        if lut is not None:
+            recolor_lut(arr, lut)
+        else:
+            recolor_array(arr)
+        label_background_array(labeler, arr)
+        im.paste(Image.fromarray(arr), box)
+
+    for y0 in range(0, h, strip_rows):
+        box = (0, y0, w, min(h, y0 + strip_rows))
+        arr = np.array(im.crop(box))
+        clear_edge_runs_array(labeler, arr, y0)
+        if lut is not None:
+            clean_light_fringe_lut(arr, lut)
+        else:
+            clean_light_fringe_array(arr)
+        im.paste(Image.fromarray(arr), box)
+
+
+def process_image(
+    src: Path, dest: Path, engine: str = DEFAULT_ENGINE, strip_rows: int | None = None
+) -> Image.Image:
     im = Image.open(src).convert("RGBA")
     w, h = im.size
-    px = im.load()
-    for y in range(h):
-        for x in range(w):
-            px[x, y] = recolor_pixel(*px[x, y])
-    flood_clear_background(im)
-    clean_light_fringe(im)
+    if engine in ("numpy", "lut"):
+        # Works on ``im`` in place so its PNG metadata (ICC profile) survives
+        process_strips(im, engine, strip_rows or h)
+    else:
+        px = im.load()
+        for y in range(h):
+            for x in range(w):
+                px[x, y] = recolor_pixel(*px[x, y])
+        flood_clear_background(im)
+        clean_light_fringe(im)
     dest.parent.mkdir(parents=True, exist_ok=True)
     im.save(dest, optimize=True)
     print(f"wrote {dest} ({w}x{h})")
@@ -172,23 +526,398 @@ def crop_mark(full: Image.Image) -> Image.Image:
     return canvas
 
 
+def count_near_white(im: Image.Image, strip_rows: int = 256) -> int:
+    """Count opaque near-white pixels one strip at a time."""
+    w, h = im.size
+    total = 0
+    for y0 in range(0, h, strip_rows):
+        strip = im.crop((0, y0, w, min(h, y0 + strip_rows)))
+        if HAS_NUMPY:
+            arr = np.asarray(strip)
+            total += int(((arr[..., 3] > 20) & (arr[..., :3].min(axis=-1) > 210)).sum())
+        else:
+            data = strip.tobytes()
+            total += sum(
+                1
+                for i in range(0, len(data), 4)
+                if data[i + 3] > 20 and min(data[i], data[i + 1], data[i + 2]) > 210
+            )
+    return total
+
+
+def resize_icon(mark: Image.Image, size: int) -> Image.Image:
+    return mark.resize((size, size), Image.Resampling.LANCZOS)
+
+
+def save_icon(im: Image.Image, path: Path, fmt: str, **params) -> Path:
+    im.save(path, **ICON_FORMATS[fmt], **params)
+    print(f"wrote {path} ({im.size[0]}x{im.size[1]}, {path.stat().st_size:,} bytes)")
+    return path
+
+
+def export_icons(
+    mark: Image.Image,
+    out_dir: Path,
+    name: str,
+    icon_sizes: tuple[int, ...],
+    formats: tuple[str, ...],
+) -> list[Path]:
+    """Write ``<name>-<size>.<fmt>`` for every size and format from the in-memory mark.
+
+    Non-PNG formats also get the mark at native size (``<name>.<fmt>``); the
+    PNG one is written by render_logo. Formats this Pillow build cannot
+    encode are skipped with a warning.
+    """
+    written = []
+    for fmt in formats:
+        if fmt in ("webp", "avif") and not features.check(fmt):
+            print(f"warning: Pillow has no {fmt} support, skipping", file=sys.stderr)
+            continue
+        if fmt == "ico":
+            sizes = [(size, size) for size in icon_sizes if size <= 256] or [(16, 16), (32, 32), (48, 48)]
+            written.append(save_icon(mark, out_dir / f"{name}.ico", fmt, sizes=sizes))
+            continue
+        if fmt != "png":
+            written.append(save_icon(mark, out_dir / f"{name}.{fmt}", fmt))
+        for size in icon_sizes:
+            written.append(save_icon(resize_icon(mark, size), out_dir / f"{name}-{size}.{fmt}", fmt))
+
+    total = sum(path.stat().st_size for path in written)
+    if written:
+        print(f"icons: {len(written)} files, {total:,} bytes")
+    return written
+
+
+def render_logo(
+    src: Path,
+    out_dir: Path,
+    name: str = "logo",
+    icon_sizes: tuple[int, ...] = (),
+    engine: str = DEFAULT_ENGINE,
+    strip_rows: int | None = None,
+    formats: tuple[str, ...] = ("png",),
+) -> tuple[Image.Image, list[Path]]:
+    """Write ``<name>-full.png``, the ``<name>.png`` mark and its exported icons."""
+    full = process_image(src, out_dir / f"{name}-full.png", engine, strip_rows)
+    written = [out_dir / f"{name}-full.png"]
+
+    mark = crop_mark(full)
+    mark_path = out_dir / f"{name}.png"
+    mark.save(mark_path, optimize=True)
+    print(f"wrote {mark_path} ({mark.size[0]}x{mark.size[1]})")
+    written.append(mark_path)
+
+    written.extend(export_icons(mark, out_dir, name, icon_sizes, formats))
+    return full, written
+
+
+def batch_job(
+    src: Path,
+    out_dir: Path,
+    name: str,
+    icon_sizes: tuple[int, ...],
+    engine: str,
+    strip_rows: int | None,
+    formats: tuple[str, ...],
+) -> tuple[Path, list[Path], float]:
+    """Process-pool entry point: render one source, return its outputs and wall time."""
+    started = time.perf_counter()
+    _, written = render_logo(src, out_dir, name, icon_sizes, engine, strip_rows, formats)
+    return src, written, time.perf_counter() - started
+
+
+def load_batch(
+    target: Path, out_dir: Path, icon_sizes: tuple[int, ...]
+) -> list[tuple[Path, Path, str, tuple[int, ...]]]:
+    """Expand a source directory or JSON manifest into (src, out_dir, name, sizes) jobs.
+
+    A manifest looks like::
+
+        {"output": "../public", "icon_sizes": [16, 32, 180],
+         "sources": [{"source": "logo-source.png", "name": "logo"},
+                     {"source": "logo-alt.png", "icon_sizes": [512]}]}
+
+    Relative paths are resolved against the manifest's directory. Two jobs
+    writing the same output name (logo.png and logo.webp in a directory, or
+    a repeated manifest name) are rejected rather than left to overwrite
+    each other.
+    """
+    if target.is_dir():
+        jobs = [
+            (src, out_dir, src.stem, icon_sizes)
+            for src in sorted(target.iterdir())
+            if src.suffix.lower() in (".png", ".jpg", ".jpeg", ".webp")
+        ]
+    else:
+        with open(target) as f:
+            manifest = json.load(f)
+        base = target.parent
+        out = base / manifest["output"] if "output" in manifest else out_dir
+        sizes = tuple(manifest.get("icon_sizes", icon_sizes))
+        jobs = []
+        for entry in manifest.get("sources", []):
+            src = base / entry["source"]
+            name = entry.get("name", src.stem)
+            jobs.append((src, out, name, tuple(entry.get("icon_sizes", sizes))))
+
+    claimed: dict[Path, Path] = {}
+    clashes = []
+    for src, out, name, _ in jobs:
+        if out / name in claimed:
+            clashes.append(f"{claimed[out / name]} and {src} both write {out / name}")
+        else:
+            claimed[out / name] = src
+    if clashes:
+        for clash in clashes:
+            print(f"duplicate output name: {clash}", file=sys.stderr)
+        sys.exit(1)
+    return jobs
+
+
+# --- Output cache -------------------------------------------------------------
+
+
+def file_digest(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def params_digest(name: str, icon_sizes: tuple[int, ...], formats: tuple[str, ...] = ("png",)) -> str:
+    """Hash everything besides the source that shapes the outputs.
+
+    Thresholds are literals in the functions above, so the script itself is
+    part of the key alongside the palette.
+    """
+    h = hashlib.sha256(Path(__file__).read_bytes())
+    palette = [BRAND_DARK, BRAND_MID, BRAND_LIGHT, BRAND_HIGHLIGHT]
+    h.update(json.dumps([palette, name, list(icon_sizes), list(formats)]).encode())
+    return h.hexdigest()
+
+
+def load_cache() -> dict:
+    try:
+        with open(CACHE_FILE) as f:
+            return json.load(f)
+    except (IOError, json.JSONDecodeError):
+        return {}
+
+
+def save_cache(cache: dict) -> None:
+    CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with open(CACHE_FILE, "w") as f:
+        json.dump(cache, f, indent=2, sort_keys=True)
+
+
+def check_cache(
+    cache: dict,
+    src: Path,
+    out_dir: Path,
+    name: str,
+    icon_sizes: tuple[int, ...],
+    formats: tuple[str, ...] = ("png",),
+) -> tuple[dict, str | None]:
+    """Return (fresh cache entry, reason for a miss or None on a hit)."""
+    entry = {"source": file_digest(src), "params": params_digest(name, icon_sizes, formats)}
+    cached = cache.get(str(out_dir / name))
+    if not cached:
+        return entry, "not cached"
+    if cached.get("source") != entry["source"]:
+        return entry, "source changed"
+    if cached.get("params") != entry["params"]:
+        return entry, "palette/params changed"
+    for path, digest in cached.get("outputs", {}).items():
+        if not Path(path).exists() or file_digest(Path(path)) != digest:
+            return entry, f"output changed: {Path(path).name}"
+    return entry, None
+
+
+def record_cache(cache: dict, out_dir: Path, name: str, entry: dict, written: list[Path]) -> None:
+    entry["outputs"] = {str(path): file_digest(path) for path in written}
+    cache[str(out_dir / name)] = entry
+
+
+def run_batch(
+    jobs: list[tuple[Path, Path, str, tuple[int, ...]]],
+    engine: str,
+    workers: int,
+    cache: dict | None = None,
+    strip_rows: int | None = None,
+    formats: tuple[str, ...] = ("png",),
+) -> None:
+    missing = [src for src, *_ in jobs if not src.exists()]
+    if missing:
+        for src in missing:
+            print(f"source not found: {src}", file=sys.stderr)
+        sys.exit(1)
+
+    started = time.perf_counter()
+    if engine == "lut":
+        # Build and persist once here rather than racing in every worker
+        color_lut()
+
+    pending = {}
+    hits = 0
+    for src, out_dir, name, icon_sizes in jobs:
+        if cache is None:
+            pending[src, out_dir, name] = (icon_sizes, None)
+            continue
+        entry, reason = check_cache(cache, src, out_dir, name, icon_sizes, formats)
+        if reason is None:
+            print(f"cache hit: {src.name} -> {out_dir / name}")
+            hits += 1
+        else:
+            print(f"cache miss: {src.name} -> {out_dir / name} ({reason})")
+            pending[src, out_dir, name] = (icon_sizes, entry)
+
+    timings = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(
+                batch_job, src, out_dir, name, icon_sizes, engine, strip_rows, formats
+            ): (src, out_dir, name, entry)
+            for (src, out_dir, name), (icon_sizes, entry) in pending.items()
+        }
+        failed = []
+        for future in as_completed(futures):
+            src, out_dir, name, entry = futures[future]
+            try:
+                src, written, elapsed = future.result()
+            except Exception as e:
+                # Keep going: the other sources' outputs and cache entries still count
+                print(f"failed: {src} -> {out_dir / name}: {e}", file=sys.stderr)
+                failed.append(src)
+                continue
+            timings.append((src, len(written), elapsed))
+            if cache is not None:
+                record_cache(cache, out_dir, name, entry, written)
+    if cache is not None:
+        save_cache(cache)
+
+    print(f"\nbatch: {len(jobs)} sources, {workers} workers")
+    for src, count, elapsed in sorted(timings):
+        print(f"  {src.name}: {count} files in {elapsed:.2f}s")
+    if cache is not None:
+        print(f"cache: {hits} hit, {len(pending)} miss")
+    print(f"total: {time.perf_counter() - started:.2f}s")
+    if failed:
+        print(f"{len(failed)} of {len(jobs)} sources failed", file=sys.stderr)
+        sys.exit(1)
+
+
+def parse_sizes(value: str) -> tuple[int, ...]:
+    return tuple(int(size) for size in value.split(",") if size.strip())
+
+
+def parse_formats(value: str) -> tuple[str, ...]:
+    formats = tuple(fmt.strip().lower() for fmt in value.split(",") if fmt.strip())
+    unknown = [fmt for fmt in formats if fmt not in ICON_FORMATS]
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            f"unknown format(s) {', '.join(unknown)}; choose from {', '.join(ICON_FORMATS)}"
+        )
+    return formats
+
+
 def main() -> None:
-    root = Path(__file__).resolve().parents[1]
-    src = Path(sys.argv[1]) if len(sys.argv) > 1 else root / "assets/logo-source.png"
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "source",
+        nargs="?",
+        type=Path,
+        default=ROOT / "assets/logo-source.png",
+        help="Source logo image",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=ENGINES,
+        default=DEFAULT_ENGINE,
+        help="pixel: reference per-pixel loop; numpy: whole-array engine; "
+        "lut: numpy with a persisted per-colour table (all give the same output)",
+    )
+    parser.add_argument(
+        "--batch",
+        type=Path,
+        help="Directory of sources or JSON manifest; renders every logo in a process pool",
+    )
+    parser.add_argument(
+        "--output", "-o",
+        type=Path,
+        default=ROOT / "public",
+        help="Output directory (batch manifests may override)",
+    )
+    parser.add_argument(
+        "--icon-sizes",
+        type=parse_sizes,
+        help="Comma-separated square icon sizes to export from the mark "
+        f"(default: none for a single logo, {','.join(map(str, DEFAULT_ICON_SIZES))} in batch mode)",
+    )
+    parser.add_argument(
+        "--formats",
+        type=parse_formats,
+        default=("png",),
+        help=f"Comma-separated icon formats: {', '.join(ICON_FORMATS)} (default: png)",
+    )
+    parser.add_argument(
+        "--jobs", "-j",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes for batch mode (default: CPU count)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=f"Always re-render, ignoring {CACHE_FILE.relative_to(ROOT)}",
+    )
+    parser.add_argument(
+        "--strip-rows",
+        type=int,
+        help="numpy/lut engines: process this many rows at a time to bound memory "
+        "on print-resolution sources (default: whole image)",
+    )
+    args = parser.parse_args()
+    cache = None if args.no_cache else load_cache()
+
+    if args.engine != "pixel" and not HAS_NUMPY:
+        print(f"{args.engine} engine requires numpy: pip3 install numpy", file=sys.stderr)
+        sys.exit(1)
+    if args.strip_rows is not None and (args.engine == "pixel" or args.strip_rows < 1):
+        print("--strip-rows needs a positive row count and the numpy or lut engine", file=sys.stderr)
+        sys.exit(1)
+
+    if args.batch:
+        if not args.batch.exists():
+            print(f"batch source not found: {args.batch}", file=sys.stderr)
+            sys.exit(1)
+        icon_sizes = DEFAULT_ICON_SIZES if args.icon_sizes is None else args.icon_sizes
+        jobs = load_batch(args.batch, args.output, icon_sizes)
+        run_batch(jobs, args.engine, max(1, args.jobs), cache, args.strip_rows, args.formats)
+        return
+
+    src = args.source
     if not src.exists():
         print(f"source not found: {src}", file=sys.stderr)
         sys.exit(1)
 
-    public = root / "public"
-    full = process_image(src, public / "logo-full.png")
-    mark = crop_mark(full)
-    mark.save(public / "logo.png", optimize=True)
-    print(f"wrote {public / 'logo.png'} ({mark.size[0]}x{mark.size[1]})")
+    icon_sizes = args.icon_sizes or ()
+    if cache is not None:
+        entry, reason = check_cache(cache, src, args.output, "logo", icon_sizes, args.formats)
+        if reason is None:
+            print(f"cache hit: {src.name} -> {args.output / 'logo'} (outputs current, skipped)")
+            return
+        print(f"cache miss: {src.name} -> {args.output / 'logo'} ({reason})")
+
+    full, written = render_logo(
+        src, args.output, "logo", icon_sizes, args.engine, args.strip_rows, args.formats
+    )
+    if cache is not None:
+        record_cache(cache, args.output, "logo", entry, written)
+        save_cache(cache)
 
     # Stats
-    px = list(full.getdata())
-    white_left = sum(1 for r, g, b, a in px if a > 20 and min(r, g, b) > 210)
-    print(f"near-white opaque pixels remaining: {white_left}")
+    print(f"near-white opaque pixels remaining: {count_near_white(full)}")
 
 
 if __name__ == "__main__":
@@ -1,66 +1,312 @@
 #!/usr/bin/env python3
 """Split BLOG.md into individual chapter files for VitePress"""
 
+import argparse
+import hashlib
+import json
 import re
 import os
+import threading
+import time
 
-def split_blog():
-    blog_path = 'content/BLOG.md'
-    chapters_dir = 'chapters'
+# watchdog is optional - watch mode falls back to polling
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+    HAS_WATCHDOG = True
+except ImportError:
+    HAS_WATCHDOG = False
+
+BLOG_PATH = 'content/BLOG.md'
+MANIFEST_NAME = '.split-manifest.json'
+CHAPTER_RE = re.compile(r'^## (Chapter (\d+):|Appendix:) (.+)$')
+SECTION_RE = re.compile(r'^## .+$')
+
+def file_hash(filename):
+    h = hashlib.sha256()
+    with open(filename, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+def load_manifest(chapters_dir):
+    """Map of generated chapter filename -> content hash from the last run."""
+    try:
+        with open(os.path.join(chapters_dir, MANIFEST_NAME)) as f:
+            return json.load(f)
+    except (IOError, json.JSONDecodeError):
+        return {}
+
+def save_manifest(chapters_dir, manifest):
+    with open(os.path.join(chapters_dir, MANIFEST_NAME), 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+class ChapterWriter:
+    """Stream one chapter to a temp file next to its final name.
     
-    os.makedirs(chapters_dir, exist_ok=True)
+    Lines are fed one at a time. ``##`` lines are blanked and surrounding
+    whitespace is held back until real content follows, which matches
+    ``re.sub(r'^## .+$', '', chapter).strip()`` without keeping the chapter
+    in memory.
+    """
+    
+    def __init__(self, filename, header):
+        self.filename = filename
+        self.tmp = filename + '.tmp'
+        self.f = open(self.tmp, 'w', encoding='utf-8')
+        self.hash = hashlib.sha256()
+        self.started = False
+        self.pending = ''
+        self.dangling = None
+        self._write(header)
+    
+    def _write(self, text):
+        self.f.write(text)
+        self.hash.update(text.encode('utf-8'))
     
-    with open(blog_path, 'r') as f:
-        content = f.read()
+    def _emit(self, segment):
+        if not self.started:
+            segment = segment.lstrip()
+            if not segment:
+                return
+            self.started = True
+        core = segment.rstrip()
+        if core:
+            self._write(self.pending + core)
+            self.pending = segment[len(core):]
+            self.dangling = None
+        else:
+            self.pending += segment
     
-    # Split by chapter markers
-    chapter_pattern = r'^## (Chapter \d+:|Appendix:) (.+)$'
+    def add_line(self, line):
+        if SECTION_RE.match(line):
+            self._emit('\n')
+            self.dangling = None
+            if line.rstrip() == '##':
+                # The chapter used to be stripped before blanking ## lines, so a
+                # closing "## " survived as "##"; keep it if nothing follows
+                self.dangling = self.pending if self.started else ''
+            return
+        self._emit('\n' + line)
+    
+    def close(self):
+        """Finish the temp file and return the chapter's content hash."""
+        if self.dangling is not None:
+            self._write(self.dangling + '##')
+        self.f.close()
+        return self.hash.hexdigest()
+
+def finish_chapter(writer, previous, rewritten=False):
+    """Move the chapter into place unless the file already holds it.
+    
+    Untouched files keep their mtime, so the VitePress dev server only
+    re-renders chapters whose content actually changed. ``rewritten`` means
+    another chapter already went to this filename this run, so the manifest
+    no longer describes the file and only its on-disk hash is trusted.
+    Returns (written, content hash).
+    """
+    digest = writer.close()
+    filename = writer.filename
+    recorded = previous.get(filename) == digest and not rewritten
+    if os.path.exists(filename) and (recorded or file_hash(filename) == digest):
+        os.remove(writer.tmp)
+        return False, digest
+    os.replace(writer.tmp, filename)
+    return True, digest
+
+def scan_regions(blog_path):
+    """Hash the raw lines of every chapter region, keyed by its header line.
+    
+    A header that appears twice maps to None so it is always re-split.
+    """
+    regions = {}
+    header = None
+    h = None
+    with open(blog_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if CHAPTER_RE.match(line.rstrip('\n')):
+                if header is not None and h is not None:
+                    regions[header] = h.hexdigest()
+                header = line.rstrip('\n')
+                if header in regions:
+                    regions[header] = None
+                    h = None
+                else:
+                    h = hashlib.sha256()
+            if h is not None:
+                h.update(line.encode('utf-8'))
+    if header is not None and h is not None:
+        regions[header] = h.hexdigest()
+    return regions
+
+def split_blog(state=None):
+    """Split BLOG.md into chapters/; returns [(num, title, filename)].
+    
+    ``state`` is the chapter index watch mode keeps between runs: the
+    manifest plus a hash of each chapter's raw region. With it, regions
+    whose source lines are unchanged are skipped instead of re-split.
+    """
+    blog_path = BLOG_PATH
+    chapters_dir = 'chapters'
+    
+    os.makedirs(chapters_dir, exist_ok=True)
+    if state is not None and 'manifest' in state:
+        previous = state['manifest']
+    else:
+        previous = load_manifest(chapters_dir)
+    regions = scan_regions(blog_path) if state is not None else {}
+    known = state.get('regions', {}) if state is not None else {}
+    manifest = {}
+    updated = unchanged = 0
     chapters = []
+    writer = None
     
-    # Find all chapter starts
-    matches = list(re.finditer(chapter_pattern, content, re.MULTILINE))
+    def finish():
+        nonlocal updated, unchanged
+        written, digest = finish_chapter(writer, previous, writer.filename in manifest)
+        if written:
+            print(f'Updated: {writer.filename}')
+            updated += 1
+        else:
+            unchanged += 1
+        manifest[writer.filename] = digest
     
-    for i, match in enumerate(matches):
-        start = match.start()
-        end = matches[i+1].start() if i+1 < len(matches) else len(content)
-        chapter_text = content[start:end].strip()
-        
-        # Extract chapter info
-        header_match = re.match(r'^## (Chapter (\d+):|Appendix:) (.+)$', chapter_text, re.MULTILINE)
-        if header_match:
+    # Single pass: each chapter streams to disk as its lines arrive
+    with open(blog_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.endswith('\n'):
+                line = line[:-1]
+            
+            header_match = CHAPTER_RE.match(line)
+            if not header_match:
+                if writer:
+                    writer.add_line(line)
+                continue
+            
+            if writer:
+                finish()
+                writer = None
+            
+            # Extract chapter info
             is_appendix = 'Appendix' in header_match.group(1)
             if is_appendix:
                 num = 'appendix'
                 title = 'Reference Materials'
-            else:
-                num = int(header_match.group(2))
-                title = header_match.group(3).strip()
-            
-            # Remove the ## header from content
-            body = re.sub(r'^## .+$', '', chapter_text, flags=re.MULTILINE).strip()
-            
-            # Create filename
-            if is_appendix:
                 filename = f'{chapters_dir}/appendix.md'
                 header = '# Appendix: Reference Materials\n\n'
             else:
+                num = int(header_match.group(2))
+                title = header_match.group(3).strip()
                 slug = re.sub(r'[^\w\s-]', '', title.lower())
                 slug = re.sub(r'[-\s]+', '-', slug)
                 filename = f'{chapters_dir}/{num:02d}-{slug}.md'
                 header = f'# Chapter {num}: {title}\n\n'
             
-            # Write file
-            with open(filename, 'w') as f:
-                f.write(header + body)
-            
-            print(f'Created: {filename}')
             chapters.append((num, title, filename))
+            region = regions.get(line)
+            # A filename already produced this run (two headers with the same
+            # slug) must be re-split so the last occurrence still wins
+            if (region is not None and region == known.get(line) and filename in previous
+                    and filename not in manifest and os.path.exists(filename)):
+                manifest[filename] = previous[filename]
+                unchanged += 1
+                continue
+            writer = ChapterWriter(filename, header)
+    
+    if writer:
+        finish()
+    
+    # Drop chapters we generated last time that no longer exist in BLOG.md
+    removed = 0
+    for filename in sorted(set(previous) - set(manifest)):
+        if os.path.exists(filename):
+            os.remove(filename)
+            print(f'Removed: {filename}')
+            removed += 1
+    save_manifest(chapters_dir, manifest)
+    if state is not None:
+        state['manifest'] = manifest
+        state['regions'] = regions
     
-    print(f'\nTotal chapters created: {len(chapters)}')
+    print(f'\nTotal chapters: {len(chapters)} ({unchanged} unchanged, {updated} updated, {removed} removed)')
     return chapters
 
-if __name__ == '__main__':
-    split_blog()
+def stat_signature(path):
+    try:
+        st = os.stat(path)
+        return st.st_mtime_ns, st.st_size
+    except FileNotFoundError:
+        return None
+
+def start_watcher(path, changed, interval, poll):
+    """Set ``changed`` whenever ``path`` is saved; watchdog if available, else polling."""
+    target = os.path.abspath(path)
+    if HAS_WATCHDOG and not poll:
+        class Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                # Editors often save by renaming a temp file over the target
+                paths = (event.src_path, getattr(event, 'dest_path', ''))
+                if target in (os.path.abspath(p) for p in paths if p):
+                    changed.set()
+        
+        observer = Observer()
+        observer.schedule(Handler(), os.path.dirname(target))
+        observer.daemon = True
+        observer.start()
+        return 'watchdog'
+    
+    def poll_loop():
+        last = stat_signature(target)
+        while True:
+            time.sleep(interval)
+            current = stat_signature(target)
+            if current != last:
+                last = current
+                changed.set()
+    
+    threading.Thread(target=poll_loop, daemon=True).start()
+    return f'polling every {interval}s'
 
+def watch(interval=0.5, debounce=0.2, poll=False):
+    """Re-split whenever BLOG.md changes, coalescing bursts of saves."""
+    state = {}
+    split_blog(state)
+    changed = threading.Event()
+    mode = start_watcher(BLOG_PATH, changed, interval, poll)
+    print(f'\nWatching {BLOG_PATH} ({mode}); Ctrl+C to stop')
+    try:
+        while True:
+            changed.wait()
+            # Debounce: wait until the file has been quiet for ``debounce`` seconds
+            while True:
+                changed.clear()
+                if not changed.wait(debounce):
+                    break
+            if stat_signature(BLOG_PATH) is None:
+                continue
+            started = time.perf_counter()
+            split_blog(state)
+            print(f'Re-split in {(time.perf_counter() - started) * 1000:.0f} ms')
+    except KeyboardInterrupt:
+        print('\nStopped watching')
 
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--watch', '-w', action='store_true',
+                        help='Keep running and re-split chapters when BLOG.md changes')
+    parser.add_argument('--interval', type=float, default=0.5,
+                        help='Polling interval in seconds when watchdog is unavailable (default: 0.5)')
+    parser.add_argument('--debounce', type=float, default=0.2,
+                        help='Quiet period before re-splitting after a save (default: 0.2)')
+    parser.add_argument('--poll', action='store_true',
+                        help='Poll the file even if watchdog is installed')
+    args = parser.parse_args()
+    
+    if args.watch:
+        watch(args.interval, args.debounce, args.poll)
+    else:
+        split_blog()
 
+if __name__ == '__main__':
+    main()
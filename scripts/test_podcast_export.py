@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""Tests for podcast-export/export.py's GitHub cache and git history, against a stub
+gh and a scratch git repo (run: python3 -m pytest scripts/ or python3 scripts/test_podcast_export.py)"""
+
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "podcast-export"))
+import export  # noqa: E402
+
+# Stands in for `gh issue|pr list`: serves the items in $FAKE_GH_DB, honours
+# --limit and --search updated:>=, logs each call to $FAKE_GH_LOG and exits 1
+# if the db has "fail" set
+STUB_GH = """#!{python}
+import json, os, sys
+args = sys.argv[1:]
+with open(os.environ["FAKE_GH_LOG"], "a") as f:
+    f.write(json.dumps(args) + "\\n")
+with open(os.environ["FAKE_GH_DB"]) as f:
+    db = json.load(f)
+if db.get("fail"):
+    sys.exit("gh: HTTP 502")
+items = db[args[0]]
+if "--search" in args:
+    since = args[args.index("--search") + 1].split(">=", 1)[1]
+    items = [item for item in items if item["updatedAt"] >= since]
+items = sorted(items, key=lambda item: -item["number"])
+print(json.dumps(items[:int(args[args.index("--limit") + 1])]))
+"""
+
+
+def item(number, updated, title=None):
+    return {
+        "number": number, "title": title or f"item {number}", "body": "", "state": "OPEN",
+        "createdAt": "2026-01-01T00:00:00Z", "updatedAt": updated, "labels": []
+    }
+
+
+class GitHubCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = Path(self.tmp.name)
+        bin_dir = root / "bin"
+        bin_dir.mkdir()
+        gh = bin_dir / "gh"
+        gh.write_text(STUB_GH.format(python=sys.executable))
+        gh.chmod(0o755)
+        self.db = root / "db.json"
+        self.log = root / "calls.log"
+        self.cache = root / "cache" / "github.json"
+        env = {
+            "PATH": f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}",
+            "FAKE_GH_DB": str(self.db),
+            "FAKE_GH_LOG": str(self.log)
+        }
+        patcher = mock.patch.dict(os.environ, env)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmp.cleanup)
+        self.serve(
+            issue=[item(1, "2026-01-02T00:00:00Z"), item(2, "2026-01-03T00:00:00Z")],
+            pr=[item(3, "2026-01-04T00:00:00Z")]
+        )
+    
+    def serve(self, fail=False, **items):
+        db = json.loads(self.db.read_text()) if self.db.exists() else {}
+        db.update(items, fail=fail)
+        self.db.write_text(json.dumps(db))
+    
+    def calls(self):
+        if not self.log.exists():
+            return []
+        calls = [json.loads(line) for line in self.log.read_text().splitlines()]
+        self.log.unlink()
+        return calls
+    
+    def fetch(self, **kwargs):
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            issues = export.get_github_issues("owner/repo", cache_path=self.cache, **kwargs)
+        self.output = out.getvalue()
+        return [(i.get("type", "issue"), i["number"], i["title"]) for i in issues]
+    
+    def test_first_fetch_lists_everything(self):
+        self.assertEqual(
+            self.fetch(),
+            [("issue", 2, "item 2"), ("issue", 1, "item 1"), ("pr", 3, "item 3")]
+        )
+        calls = self.calls()
+        self.assertEqual(sorted(call[0] for call in calls), ["issue", "pr"])
+        for call in calls:
+            self.assertEqual(call[call.index("--limit") + 1], str(export.GH_FETCH_ALL))
+            self.assertNotIn("--search", call)
+        self.assertTrue(self.cache.exists())
+    
+    def test_refresh_merges_updated_items(self):
+        self.fetch()
+        self.calls()
+        self.serve(
+            issue=[
+                item(1, "2026-01-02T00:00:00Z"),
+                item(2, "2026-02-01T00:00:00Z", "item 2 edited"),
+                item(4, "2026-02-02T00:00:00Z")
+            ],
+            pr=[item(3, "2026-01-04T00:00:00Z")]
+        )
+        self.assertEqual(
+            self.fetch(),
+            [("issue", 4, "item 4"), ("issue", 2, "item 2 edited"), ("issue", 1, "item 1"), ("pr", 3, "item 3")]
+        )
+        searches = {call[0]: call[call.index("--search") + 1] for call in self.calls()}
+        self.assertEqual(
+            searches,
+            {"issue": "updated:>=2026-01-03T00:00:00Z", "pr": "updated:>=2026-01-04T00:00:00Z"}
+        )
+    
+    def test_failure_serves_cache(self):
+        expected = self.fetch()
+        cached = self.cache.read_text()
+        self.serve(fail=True, issue=[item(5, "2026-03-01T00:00:00Z")])
+        self.assertEqual(self.fetch(), expected)
+        self.assertIn("gh: HTTP 502", self.output)
+        self.assertEqual(self.cache.read_text(), cached)
+    
+    def test_offline_does_not_call_gh(self):
+        expected = self.fetch()
+        self.calls()
+        self.serve(issue=[item(5, "2026-03-01T00:00:00Z")])
+        self.assertEqual(self.fetch(offline=True), expected)
+        self.assertEqual(self.calls(), [])
+    
+    def test_offline_without_cache(self):
+        self.assertEqual(self.fetch(offline=True), [])
+        self.assertIn("No cached GitHub issues", self.output)
+        self.assertEqual(self.calls(), [])
+    
+    def test_search_cap_falls_back_to_full_list(self):
+        self.fetch()
+        self.calls()
+        # Two updated issues fill a search capped at two: some may be missing
+        self.serve(issue=[item(n, "2026-02-01T00:00:00Z") for n in (1, 2, 6)])
+        with mock.patch.object(export, "GH_SEARCH_CAP", 2):
+            self.assertEqual(
+                self.fetch(),
+                [("issue", 6, "item 6"), ("issue", 2, "item 2"), ("issue", 1, "item 1"), ("pr", 3, "item 3")]
+            )
+        issue_calls = [call for call in self.calls() if call[0] == "issue"]
+        self.assertEqual(len(issue_calls), 2)
+        self.assertIn("--search", issue_calls[0])
+        self.assertNotIn("--search", issue_calls[1])
+        self.assertEqual(issue_calls[1][issue_calls[1].index("--limit") + 1], str(export.GH_FETCH_ALL))
+    
+    def test_limit_per_kind(self):
+        self.assertEqual(self.fetch(limit=1), [("issue", 2, "item 2"), ("pr", 3, "item 3")])
+
+
+class GitHistoryTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.repo = Path(self.tmp.name)
+        self.git("init", "-q")
+        patcher = mock.patch.object(export, "PI_FLEET_ROOT", self.repo)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def git(self, *args):
+        return subprocess.run(
+            ["git", "-c", "user.name=Test", "-c", "user.email=test@example.com", *args],
+            cwd=self.repo, check=True, capture_output=True, text=True
+        ).stdout.strip()
+    
+    def commit(self, subject):
+        self.git("commit", "-q", "--allow-empty", "-m", subject)
+        return self.git("rev-parse", "HEAD")
+    
+    def history(self, *args, **kwargs):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return [c["subject"] for c in export.get_git_history(*args, **kwargs)]
+    
+    def test_reads_only_new_commits(self):
+        head = self.commit("one")
+        self.commit("two")
+        cached = {"head": head, "limit": 0, "complete": True, "commits": [{"subject": "cached one"}]}
+        with mock.patch.object(export, "iter_git_log", wraps=export.iter_git_log) as log:
+            self.assertEqual(self.history(0, cached=cached), ["two", "cached one"])
+        self.assertEqual(log.call_args.args[0], f"{head}..HEAD")
+    
+    def test_rewritten_head_reads_afresh(self):
+        self.commit("one")
+        cached = {"head": "0" * 40, "limit": 0, "complete": True, "commits": [{"subject": "gone"}]}
+        self.assertEqual(self.history(0, cached=cached), ["one"])
+    
+    def test_failure_applies_limit_to_cache(self):
+        head = self.commit("one")
+        cached = {"head": head, "limit": 0, "complete": True, "commits": [{"subject": s} for s in "abc"]}
+        with mock.patch.object(export, "iter_git_log", side_effect=subprocess.TimeoutExpired("git", 1)):
+            self.assertEqual(self.history(2, cached=cached), ["a", "b"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Tests for split-chapters.py (run: python3 -m pytest scripts/ or python3 scripts/test_split_chapters.py)"""
+
+import contextlib
+import importlib.util
+import io
+import os
+import tempfile
+import unittest
+
+SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'split-chapters.py')
+spec = importlib.util.spec_from_file_location('split_chapters', SCRIPT)
+split_chapters = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(split_chapters)
+
+
+class SplitChaptersTest(unittest.TestCase):
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmp = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp.name)
+        os.makedirs('content')
+    
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+    
+    def write_blog(self, text):
+        with open(split_chapters.BLOG_PATH, 'w', encoding='utf-8') as f:
+            f.write(text)
+    
+    def read(self, filename):
+        with open(filename, encoding='utf-8') as f:
+            return f.read()
+    
+    def split(self, state=None):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return split_chapters.split_blog(state)
+    
+    def test_repeated_header_region_is_none(self):
+        self.write_blog('## Chapter 1: A\nx\n## Chapter 1: A\ny\n## Chapter 2: B\nz\n')
+        regions = split_chapters.scan_regions(split_chapters.BLOG_PATH)
+        self.assertIsNone(regions['## Chapter 1: A'])
+        self.assertIsNotNone(regions['## Chapter 2: B'])
+    
+    def test_repeated_header_in_watch_mode(self):
+        self.write_blog('## Chapter 1: A\nx\n## Chapter 1: A\ny\n## Chapter 2: B\nz\n')
+        state = {}
+        self.split(state)
+        self.assertEqual(self.read('chapters/01-a.md'), '# Chapter 1: A\n\ny')
+        
+        # Only the repeated chapter's second region changes; it must not be skipped
+        self.write_blog('## Chapter 1: A\nx\n## Chapter 1: A\ny2\n## Chapter 2: B\nz\n')
+        self.split(state)
+        self.assertEqual(self.read('chapters/01-a.md'), '# Chapter 1: A\n\ny2')
+        self.assertEqual(self.read('chapters/02-b.md'), '# Chapter 2: B\n\nz')
+    
+    def test_same_filename_last_chapter_wins(self):
+        # Both headers slug to 02-next.md; the later one must end up on disk
+        blog = '## Chapter 2: Next\n{}\n## Chapter 2: Next!\nfinal\n'
+        self.write_blog(blog.format('old draft'))
+        for _ in range(3):
+            self.split()
+            self.assertEqual(self.read('chapters/02-next.md'), '# Chapter 2: Next!\n\nfinal')
+        self.write_blog(blog.format('new draft'))
+        for _ in range(2):
+            self.split()
+            self.assertEqual(self.read('chapters/02-next.md'), '# Chapter 2: Next!\n\nfinal')
+
+
+if __name__ == '__main__':
+    unittest.main()